@@ -7,52 +7,202 @@ Analyzes commits between releases to predict what's coming next
 import os
 import sys
 import json
-import requests
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from pathlib import Path
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Import resilience utilities for hardened automation
 sys.path.insert(0, str(Path(__file__).parent))
 from utils.resilience import (
-    ResilientLogger, retry_with_backoff, resilient_request, safe_file_write
+    ResilientLogger, retry_with_backoff, resilient_request, atomic_file_write
 )
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    # Fall back to stdlib json when orjson isn't installed
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
 load_dotenv()
 
 REPO_ROOT = Path(__file__).parent.parent
 PREDICTIONS_PATH = REPO_ROOT / "BrowserOS" / "Research" / "upcoming_features.json"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
-USE_OLLAMA = os.getenv("USE_OLLAMA", "false").lower() == "true"
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+# Per-repo head SHA watermark + last result, used to skip unchanged repos
+PREDICTIONS_STATE_PATH = PREDICTIONS_PATH.with_name("upcoming_features_state.json")
+
+
+@dataclass(frozen=True, slots=True)
+class PredictorConfig:
+    """Environment-derived settings, read once at import time"""
+    github_token: Optional[str]
+    openrouter_api_key: Optional[str]
+    ollama_api_key: Optional[str]
+    use_ollama: bool
+    ollama_base_url: str
+    openrouter_enabled: bool
+    
+    @classmethod
+    def from_env(cls) -> 'PredictorConfig':
+        openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+        return cls(
+            github_token=os.getenv("GITHUB_TOKEN"),
+            openrouter_api_key=openrouter_api_key,
+            ollama_api_key=os.getenv("OLLAMA_API_KEY"),
+            use_ollama=os.getenv("USE_OLLAMA", "false").lower() == "true",
+            ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            openrouter_enabled=bool(openrouter_api_key) and openrouter_api_key not in (
+                "your-openrouter-api-key-here", "placeholder"
+            ),
+        )
+
+
+CFG = PredictorConfig.from_env()
+
+# Max characters of commit context sent to the AI (leaves room for instructions)
+PROMPT_CHAR_BUDGET = 2000
+# Per-provider AI request timeout in seconds
+AI_TIMEOUT = 30
+
+# Static prediction prompt; only the commit context varies per repository
+_PROMPT_TEMPLATE = """Analyze these recent commits from the BrowserOS repository to predict upcoming features
+(showing {shown} of {total} commits):
+
+{context}
+
+Based on these commits, predict 3-5 upcoming features that are likely to be released soon.
+
+For each prediction:
+1. Feature name (short, catchy)
+2. Confidence level (high/medium/low)
+3. Description (1-2 sentences)
+4. Evidence (which commits suggest this)
+
+Respond in JSON format:
+[
+  {{
+    "name": "Feature name",
+    "confidence": "high",
+    "description": "What this feature does",
+    "evidence": "Commits mention X, Y, Z",
+    "category": "new_feature|improvement|ui_enhancement|performance"
+  }}
+]
+"""
+
+class _JsonArrayScanner:
+    """Incremental scanner for the first balanced top-level JSON array.
+
+    Text is fed in chunks; anything before the array is discarded as it
+    arrives, so only the array itself is ever buffered. String/escape state
+    is tracked so brackets inside JSON strings don't count.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_str = False
+        self.esc = False
+        self.parts: List[str] = []
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Consume a chunk; return the complete array text once it closes"""
+        start = 0 if self.depth else -1
+        for i, ch in enumerate(chunk):
+            if self.in_str:
+                if self.esc:
+                    self.esc = False
+                elif ch == "\\":
+                    self.esc = True
+                elif ch == '"':
+                    self.in_str = False
+            elif ch == '"':
+                if self.depth:
+                    self.in_str = True
+            elif ch == "[":
+                if self.depth == 0:
+                    start = i
+                self.depth += 1
+            elif ch == "]" and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.parts.append(chunk[start:i + 1])
+                    return "".join(self.parts)
+        if self.depth:
+            self.parts.append(chunk[start:])
+        return None
+
+
+def _extract_json_array(text: str) -> Optional[str]:
+    """Return the first balanced top-level JSON array in text, or None"""
+    return _JsonArrayScanner().feed(text)
 
 class FeaturePredictor:
     """Analyzes commits to predict upcoming features"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, force: bool = False):
         self.verbose = verbose
+        self.force = force
         self.predictions = []
         self.logger = ResilientLogger(__name__)
+        self.state = self.load_state()
         
     def log(self, message: str):
         if self.verbose:
             self.logger.info(message)
     
+    def load_state(self) -> Dict[str, Any]:
+        """Load per-repo head SHA watermarks from the previous run"""
+        if not PREDICTIONS_STATE_PATH.exists():
+            return {}
+        try:
+            return _json_loads(PREDICTIONS_STATE_PATH.read_bytes())
+        except Exception as e:
+            self.logger.warn(f"Failed to load prediction state: {e}")
+            return {}
+    
+    def save_state(self) -> bool:
+        """Persist per-repo head SHA watermarks for the next run"""
+        return atomic_file_write(
+            str(PREDICTIONS_STATE_PATH),
+            _json_dumps(self.state),
+            create_dirs=True,
+            logger=self.logger
+        )
+    
+    def get_head_sha(self, owner: str, repo: str, branch: str = "main") -> Optional[str]:
+        """Get the SHA of the branch head (SHA-only media type, no commit body)"""
+        url = f"https://api.github.com/repos/{owner}/{repo}/commits/{branch}"
+        headers = {"Accept": "application/vnd.github.sha"}
+        if CFG.github_token:
+            headers["Authorization"] = f"token {CFG.github_token}"
+        
+        response = resilient_request(url, headers=headers, timeout=10, logger=self.logger)
+        if response and response.status_code == 200:
+            return response.text.strip() or None
+        self.log(f"Error fetching head SHA: {response.status_code if response else 'No response'}")
+        return None
+    
     @retry_with_backoff(max_attempts=3, base_delay=2.0)
     def get_latest_release(self, owner: str, repo: str) -> Optional[Dict]:
         """Get the latest release from GitHub"""
         url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
         headers = {}
-        if GITHUB_TOKEN:
-            headers["Authorization"] = f"token {GITHUB_TOKEN}"
+        if CFG.github_token:
+            headers["Authorization"] = f"token {CFG.github_token}"
         
         response = resilient_request(url, headers=headers, timeout=10, logger=self.logger)
         if response and response.status_code == 200:
-            return response.json()
+            return _json_loads(response.content)
         elif response and response.status_code == 404:
             self.log(f"No releases found for {owner}/{repo}")
             return None
@@ -64,8 +214,8 @@ class FeaturePredictor:
     def get_commits_since_release(self, owner: str, repo: str, release_tag: Optional[str] = None) -> List[Dict]:
         """Get commits since the latest release using GitHub compare API"""
         headers = {}
-        if GITHUB_TOKEN:
-            headers["Authorization"] = f"token {GITHUB_TOKEN}"
+        if CFG.github_token:
+            headers["Authorization"] = f"token {CFG.github_token}"
 
         # If we have a release tag, use the compare API to get commits between
         # that tag and the main branch.
@@ -73,7 +223,7 @@ class FeaturePredictor:
             compare_url = f"https://api.github.com/repos/{owner}/{repo}/compare/{release_tag}...main"
             response = resilient_request(compare_url, headers=headers, timeout=10, logger=self.logger)
             if response and response.status_code == 200:
-                compare_data = response.json()
+                compare_data = _json_loads(response.content)
                 commits = compare_data.get("commits", [])
                 self.log(f"Found {len(commits)} commits since {release_tag}")
                 return commits
@@ -86,7 +236,7 @@ class FeaturePredictor:
         params = {"per_page": 100}
         response = resilient_request(url, headers=headers, params=params, timeout=10, logger=self.logger)
         if response and response.status_code == 200:
-            all_commits = response.json()
+            all_commits = _json_loads(response.content)
             return all_commits[:30]  # Return last 30 commits if no release
         else:
             self.log(f"Error fetching commits: {response.status_code if response else 'No response'}")
@@ -133,117 +283,166 @@ class FeaturePredictor:
     
     def predict_with_ai(self, commits: List[Dict], patterns: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Use AI to predict upcoming features based on commits"""
+        return self._predict(commits, patterns)[0]
+    
+    def _predict(self, commits: List[Dict], patterns: Dict[str, Any]) -> tuple:
+        """Return (predictions, from_ai); from_ai is False for the pattern fallback"""
         
-        # Build context from commits
+        # Build context from commits, bounded by a character budget rather than
+        # a fixed commit count so verbose subjects can't blow up the prompt
         commit_summary = []
-        for commit in commits[:20]:  # Top 20 commits
-            msg = commit["commit"]["message"].split("\n")[0]  # First line only
+        total_chars = 0
+        for commit in commits:
+            msg = commit["commit"]["message"].partition("\n")[0]  # First line only
+            msg = " ".join(msg.split())
             author = commit["commit"]["author"]["name"]
             date = commit["commit"]["author"]["date"]
-            commit_summary.append(f"- {msg} (by {author}, {date[:10]})")
+            line = f"- {msg} (by {author}, {date[:10]})"
+            if total_chars + len(line) > PROMPT_CHAR_BUDGET:
+                break
+            commit_summary.append(line)
+            total_chars += len(line) + 1
         
         context = "\n".join(commit_summary)
         
-        prompt = f"""Analyze these recent commits from the BrowserOS repository to predict upcoming features:
-
-{context}
-
-Based on these commits, predict 3-5 upcoming features that are likely to be released soon.
-
-For each prediction:
-1. Feature name (short, catchy)
-2. Confidence level (high/medium/low)
-3. Description (1-2 sentences)
-4. Evidence (which commits suggest this)
-
-Respond in JSON format:
-[
-  {{
-    "name": "Feature name",
-    "confidence": "high",
-    "description": "What this feature does",
-    "evidence": "Commits mention X, Y, Z",
-    "category": "new_feature|improvement|ui_enhancement|performance"
-  }}
-]
-"""
+        prompt = _PROMPT_TEMPLATE.format(
+            shown=len(commit_summary), total=len(commits), context=context
+        )
         
-        # Try OpenRouter first, fallback to Ollama
+        # Race OpenRouter and Ollama (whichever are enabled)
         predictions = self._query_ai(prompt)
         
         if not predictions:
             # Return basic predictions from pattern analysis
-            return self._basic_predictions(patterns)
+            return self._basic_predictions(patterns), False
         
-        return predictions
+        return predictions, True
     
     @retry_with_backoff(max_attempts=2, base_delay=1.0)
     def _query_ai(self, prompt: str) -> List[Dict[str, Any]]:
-        """Query AI service for predictions"""
-        
-        # Try OpenRouter
-        if OPENROUTER_API_KEY and OPENROUTER_API_KEY not in ["your-openrouter-api-key-here", "placeholder"]:
-            try:
-                response = resilient_request(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    method="POST",
-                    headers={
-                        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "anthropic/claude-3.5-sonnet",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": 0.3
-                    },
-                    timeout=30,
-                    logger=self.logger
-                )
-                
-                if response and response.status_code == 200:
-                    content = response.json()["choices"][0]["message"]["content"]
-                    # Extract JSON from response
-                    import re
-                    json_match = re.search(r'\[.*\]', content, re.DOTALL)
-                    if json_match:
-                        return json.loads(json_match.group())
-            except Exception as e:
-                self.logger.error(f"OpenRouter error: {e}", exc_info=True)
-        
-        # Try Ollama if explicitly enabled
-        if USE_OLLAMA:
-            try:
-                # Health check first
-                health_url = f"{OLLAMA_BASE_URL}/api/tags"
-                health_response = resilient_request(health_url, timeout=2, logger=self.logger)
-                if not health_response or health_response.status_code != 200:
-                    self.log("Ollama service not available, skipping")
-                    return []
-                
-                response = resilient_request(
-                    f"{OLLAMA_BASE_URL}/v1/chat/completions",
-                    method="POST",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "model": "llama3",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": 0.3
-                    },
-                    timeout=30,
-                    logger=self.logger
-                )
-                
-                if response and response.status_code == 200:
-                    content = response.json()["choices"][0]["message"]["content"]
-                    import re
-                    json_match = re.search(r'\[.*\]', content, re.DOTALL)
-                    if json_match:
-                        return json.loads(json_match.group())
-            except Exception as e:
-                self.logger.error(f"Ollama error: {e}", exc_info=True)
+        """Query AI services for predictions, racing enabled providers"""
+        providers = []
+        if CFG.openrouter_enabled:
+            providers.append(self._query_openrouter)
+        # Ollama only if explicitly enabled
+        if CFG.use_ollama:
+            providers.append(self._query_ollama)
+        
+        if not providers:
+            return []
+        if len(providers) == 1:
+            return providers[0](prompt)
         
+        # First provider to return usable predictions wins; a slow or failing
+        # provider no longer delays the other by its full timeout. There is no
+        # overall deadline: as with a single provider, AI_TIMEOUT bounds each
+        # read of the streamed response, so a slow but live generation finishes.
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(providers))
+        try:
+            pending = {executor.submit(provider, prompt, cancel) for provider in providers}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    predictions = future.result()
+                    if predictions:
+                        return predictions
+            return []
+        finally:
+            # Tell a still-streaming loser to close its response
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _query_openrouter(self, prompt: str, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """Query OpenRouter for predictions"""
+        try:
+            response = resilient_request(
+                "https://openrouter.ai/api/v1/chat/completions",
+                method="POST",
+                headers={
+                    "Authorization": f"Bearer {CFG.openrouter_api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": "anthropic/claude-3.5-sonnet",
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.3,
+                    "stream": True
+                },
+                timeout=AI_TIMEOUT,
+                stream=True,
+                logger=self.logger
+            )
+            
+            if response and response.status_code == 200:
+                return self._read_chat_predictions(response, cancel)
+        except Exception as e:
+            self.logger.error(f"OpenRouter error: {e}", exc_info=True)
         return []
     
+    def _query_ollama(self, prompt: str, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """Query a local Ollama instance for predictions"""
+        try:
+            # Health check first
+            health_url = f"{CFG.ollama_base_url}/api/tags"
+            health_response = resilient_request(health_url, timeout=2, logger=self.logger)
+            if not health_response or health_response.status_code != 200:
+                self.log("Ollama service not available, skipping")
+                return []
+            
+            response = resilient_request(
+                f"{CFG.ollama_base_url}/v1/chat/completions",
+                method="POST",
+                headers={"Content-Type": "application/json"},
+                json={
+                    "model": "llama3",
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.3,
+                    "stream": True
+                },
+                timeout=AI_TIMEOUT,
+                stream=True,
+                logger=self.logger
+            )
+            
+            if response and response.status_code == 200:
+                return self._read_chat_predictions(response, cancel)
+        except Exception as e:
+            self.logger.error(f"Ollama error: {e}", exc_info=True)
+        return []
+    
+    def _read_chat_predictions(self, response, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """Read a streamed chat completion, stopping once the JSON array closes
+        or once cancel is set (another provider already won the race)"""
+        try:
+            if cancel is not None and cancel.is_set():
+                return []
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                # Provider ignored stream=True; parse the buffered body instead
+                content = _json_loads(response.content)["choices"][0]["message"]["content"]
+                candidate = _extract_json_array(content)
+                return _json_loads(candidate) if candidate else []
+            
+            scanner = _JsonArrayScanner()
+            for line in response.iter_lines(decode_unicode=True):
+                if cancel is not None and cancel.is_set():
+                    break
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = _json_loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    candidate = scanner.feed(delta)
+                    if candidate:
+                        # Array is complete; drop the rest of the generation
+                        return _json_loads(candidate)
+            return []
+        finally:
+            response.close()
+    
     def _basic_predictions(self, patterns: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate basic predictions from patterns without AI"""
         predictions = []
@@ -280,12 +479,22 @@ Respond in JSON format:
     def analyze_repository(self, owner: str, repo: str) -> Dict[str, Any]:
         """Analyze a repository for upcoming features"""
         self.log(f"Analyzing {owner}/{repo}...")
+        repo_key = f"{owner}/{repo}"
         
         # Get latest release
         release = self.get_latest_release(owner, repo)
         release_tag = release["tag_name"] if release else None
         release_date = release["published_at"] if release else None
         
+        # Skip the whole analysis when nothing has landed or been released
+        # since the last run; a new tag on an unchanged head still re-runs it
+        head_sha = self.get_head_sha(owner, repo)
+        cached = self.state.get(repo_key)
+        if (not self.force and head_sha and cached and cached.get("head") == head_sha
+                and cached.get("release") == release_tag):
+            self.log(f"No new commits or releases on {repo_key} since {head_sha[:7]}, reusing last predictions")
+            return cached.get("result")
+        
         self.log(f"Latest release: {release_tag or 'None'}")
         
         # Get commits since release
@@ -299,10 +508,10 @@ Respond in JSON format:
         patterns = self.analyze_commit_patterns(commits)
         
         # Predict features
-        predictions = self.predict_with_ai(commits, patterns)
+        predictions, from_ai = self._predict(commits, patterns)
         
-        return {
-            "repository": f"{owner}/{repo}",
+        result = {
+            "repository": repo_key,
             "latest_release": release_tag,
             "release_date": release_date,
             "commits_since_release": len(commits),
@@ -316,6 +525,13 @@ Respond in JSON format:
             },
             "analyzed_at": datetime.utcnow().isoformat() + "Z"
         }
+        
+        # Only AI predictions are reused until the next commit; the pattern
+        # fallback is recomputed so a transient AI outage doesn't stick
+        if head_sha and from_ai:
+            self.state[repo_key] = {"head": head_sha, "release": release_tag, "result": result}
+        
+        return result
     
     def run(self):
         """Main execution"""
@@ -336,17 +552,16 @@ Respond in JSON format:
                 all_predictions["repositories"].append(result)
         
         # Save predictions
-        PREDICTIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        predictions_json = json.dumps(all_predictions, indent=2)
-        success = safe_file_write(
+        success = atomic_file_write(
             str(PREDICTIONS_PATH),
-            predictions_json,
+            _json_dumps(all_predictions),
             create_dirs=True,
             logger=self.logger
         )
         
         if success:
             self.log(f"\n✓ Predictions saved to {PREDICTIONS_PATH}")
+            self.save_state()
         else:
             self.logger.error(f"Failed to save predictions to {PREDICTIONS_PATH}")
         
@@ -356,10 +571,11 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description="Predict upcoming BrowserOS features")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument("--force", action="store_true", help="Re-analyze repositories even if their head commit is unchanged")
     args = parser.parse_args()
     
     try:
-        predictor = FeaturePredictor(verbose=args.verbose)
+        predictor = FeaturePredictor(verbose=args.verbose, force=args.force)
         count = predictor.run()
         print(f"\n✓ Analyzed {count} repositories and generated predictions")
         return 0
@@ -370,5 +586,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
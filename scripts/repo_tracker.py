@@ -6,11 +6,19 @@ Enables incremental updates by tracking what's been processed.
 """
 
 import os
+import re
+import sys
+import copy
 import json
-from datetime import datetime
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
 
 try:
     from github import Github, Repository, Commit, GitRelease
@@ -19,9 +27,103 @@ except ImportError:
     GITHUB_AVAILABLE = False
     print("⚠️ PyGithub not installed. Install with: pip install PyGithub")
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 from dotenv import load_dotenv
 load_dotenv()
 
+from utils.resilience import atomic_file_write
+
+# Max concurrent per-commit detail requests (keeps clear of GitHub abuse limits)
+COMMIT_DETAIL_WORKERS = 8
+
+# Commit categories in priority order; a commit lands in the first that matches
+CATEGORY_KEYWORDS = {
+    'features': ['feat', 'feature', 'add', 'implement', 'new'],
+    'bug_fixes': ['fix', 'bug', 'issue', 'resolve', 'patch'],
+    'breaking_changes': ['breaking', 'break', 'major', 'remove'],
+    'documentation': ['docs', 'doc', 'documentation', 'readme'],
+    'deprecations': ['deprecate', 'deprecated', 'obsolete']
+}
+
+# CHANGELOG.md version header lines
+CHANGELOG_HEADER_RE = re.compile(r'^## .*$', re.MULTILINE)
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Commit history with line stats in a single round trip (REST needs 1 + N)
+COMMIT_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $since: GitTimestamp) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $first, since: $since) {
+            nodes {
+              oid
+              message
+              url
+              additions
+              deletions
+              author { name date }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def _compile_category_pattern(keywords: Dict[str, List[str]]) -> 're.Pattern':
+    """Compile category keywords into one regex.
+    
+    Each category is a lookahead branch ending in an empty named group, tried
+    in dict order at position 0. This keeps the substring and first-category-
+    wins semantics of the old per-keyword loop; match.lastgroup names the hit.
+    """
+    branches = [
+        f"(?=.*?(?:{'|'.join(re.escape(kw) for kw in kw_list)}))(?P<{category}>)"
+        for category, kw_list in keywords.items()
+    ]
+    return re.compile('|'.join(branches), re.IGNORECASE | re.DOTALL)
+
+
+def _build_category_automaton(keywords: Dict[str, List[str]]):
+    """Build an Aho-Corasick automaton mapping keyword -> (priority, category)"""
+    automaton = ahocorasick.Automaton()
+    for priority, (category, kw_list) in enumerate(keywords.items()):
+        for kw in kw_list:
+            kw = sys.intern(kw.lower())
+            # A keyword listed under two categories keeps the higher priority
+            if kw not in automaton:
+                automaton.add_word(kw, (priority, sys.intern(category)))
+    automaton.make_automaton()
+    return automaton
 
 
 @dataclass
@@ -35,9 +137,25 @@ class RepoState:
     last_updated: Optional[str] = None
     total_commits_processed: int = 0
     total_releases_processed: int = 0
+    commits_etag: Optional[str] = None
+    releases_etag: Optional[str] = None
+    changelog_sha: Optional[str] = None
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Flat fields only, so a shallow literal beats asdict()'s deep copy
+        return {
+            'repo_name': self.repo_name,
+            'last_commit_sha': self.last_commit_sha,
+            'last_commit_date': self.last_commit_date,
+            'last_release_tag': self.last_release_tag,
+            'last_release_date': self.last_release_date,
+            'last_updated': self.last_updated,
+            'total_commits_processed': self.total_commits_processed,
+            'total_releases_processed': self.total_releases_processed,
+            'commits_etag': self.commits_etag,
+            'releases_etag': self.releases_etag,
+            'changelog_sha': self.changelog_sha,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'RepoState':
@@ -47,16 +165,51 @@ class RepoState:
 class GitHubRepoTracker:
     """Track and analyze GitHub repository changes"""
     
+    # Built once per process and shared by every tracker instance
+    _CATEGORY_RE = _compile_category_pattern(CATEGORY_KEYWORDS)
+    _CATEGORY_AUTOMATON = (
+        _build_category_automaton(CATEGORY_KEYWORDS) if AHOCORASICK_AVAILABLE else None
+    )
+    
     def __init__(self, repo_name: str = "browseros-ai/BrowserOS", 
-                 state_file: Path = None):
+                 state_file: Path = None, poll_ttl: float = 0.0):
         self.repo_name = repo_name
+        # Repeat get_incremental_updates() calls within poll_ttl seconds reuse
+        # the previous result instead of polling GitHub again (0, the default,
+        # disables this; callers opt in)
+        self.poll_ttl = poll_ttl
+        self._last_update = None
         self.state_file = state_file or Path("BrowserOS/Research/repo_state.json")
+        # Parsed CHANGELOG.md, valid while state.changelog_sha matches upstream
+        cache_suffix = ".msgpack" if MSGPACK_AVAILABLE else ".json"
+        self.changelog_cache_file = self.state_file.with_name(f"{self.state_file.stem}_changelog{cache_suffix}")
         self.state = self.load_state()
-        
-        # Initialize GitHub client
+        self._dirty = False
+        # Single writer thread: state saves overlap with the next network call
+        # but still land on disk in order
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        
+        # One keep-alive session for direct REST/GraphQL calls, sized so the
+        # detail workers can each hold a pooled connection
+        self.session = requests.Session()
+        self.session.headers['Accept'] = 'application/vnd.github+json'
+        adapter = HTTPAdapter(pool_maxsize=COMMIT_DETAIL_WORKERS)
+        self.session.mount('https://', adapter)
+        
+        # GitHub client is created on first network use (see _ensure_connected)
         self.github = None
+        self.github_token = None
         self.repo = None
-        self._initialize_github()
+        self._connected = False
+        self._connect_lock = threading.Lock()
+    
+    def _ensure_connected(self) -> bool:
+        """Initialize the GitHub client once, on first use; True if usable"""
+        with self._connect_lock:
+            if not self._connected:
+                self._initialize_github()
+                self._connected = True
+        return self.repo is not None
     
     def _initialize_github(self):
         """Initialize GitHub API client"""
@@ -69,18 +222,22 @@ class GitHubRepoTracker:
         # Check for placeholder or empty token
         if not github_token or "your-github-token" in github_token:
             print("⚠️ GITHUB_TOKEN not set or invalid - using public API (limited rate)")
-            self.github = Github()
+            self.github = Github(pool_size=COMMIT_DETAIL_WORKERS)
             self._connect_to_repo()
             return
 
         # Try authenticated first
         try:
-            self.github = Github(github_token)
+            self.github = Github(github_token, pool_size=COMMIT_DETAIL_WORKERS)
+            self.github_token = github_token
+            self.session.headers['Authorization'] = f"Bearer {github_token}"
             self._connect_to_repo()
         except Exception as e:
             print(f"⚠️ Authenticated connection failed: {e}")
             print("🔄 Falling back to public API...")
-            self.github = Github()
+            self.github_token = None
+            self.session.headers.pop('Authorization', None)
+            self.github = Github(pool_size=COMMIT_DETAIL_WORKERS)
             self._connect_to_repo()
 
     def _connect_to_repo(self):
@@ -99,8 +256,7 @@ class GitHubRepoTracker:
         """Load repository state from file"""
         if self.state_file.exists():
             try:
-                with open(self.state_file) as f:
-                    data = json.load(f)
+                data = _json_loads(self.state_file.read_bytes())
                 return RepoState.from_dict(data)
             except Exception as e:
                 print(f"⚠️ Failed to load state: {e}")
@@ -109,20 +265,75 @@ class GitHubRepoTracker:
         return RepoState(repo_name=self.repo_name)
     
     def save_state(self):
-        """Save repository state to file"""
-        self.state.last_updated = datetime.now().isoformat()
-        
-        # Ensure directory exists
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        """Save repository state to file (atomically, and only if it changed)
         
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state.to_dict(), f, indent=2)
+        The state is serialized here, so later mutations can't leak into the
+        write, and the disk I/O runs on the background writer. Call close()
+        to wait for pending writes.
+        """
+        if not self._dirty:
+            return
         
+        self.state.last_updated = datetime.now().isoformat()
+        payload = _json_dumps(self.state.to_dict())
+        self._dirty = False
+        self._io_pool.submit(self._write_state, payload)
+    
+    def _write_state(self, payload: bytes):
+        """Write serialized state to disk (runs on the writer thread)"""
+        if not atomic_file_write(str(self.state_file), payload):
+            self._dirty = True
+            print(f"❌ Failed to save repo state: {self.state_file}")
+            return
         print(f"✓ Saved repo state: {self.state_file}")
     
-    def get_new_commits(self, max_count: int = 50) -> List[Dict[str, Any]]:
-        """Get commits since last processed commit"""
-        if not self.repo:
+    def close(self):
+        """Wait for pending state writes to finish"""
+        self._io_pool.shutdown(wait=True)
+    
+    def _probe_list(self, resource: str, etag: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Conditionally GET the head of a list endpoint.
+        
+        Returns (not_modified, etag). The ETag is only stored by the caller
+        after the full fetch succeeds, so a failed run is retried next time.
+        """
+        headers = {'If-None-Match': etag} if etag else {}
+        
+        try:
+            response = self.session.get(
+                f"{GITHUB_API_URL}/repos/{self.repo_name}/{resource}",
+                params={'per_page': 1},
+                headers=headers,
+                timeout=30
+            )
+        except requests.RequestException as e:
+            print(f"⚠️ Conditional {resource} check failed: {e}")
+            return False, None
+        
+        if response.status_code == 304:
+            return True, etag
+        return False, response.headers.get('ETag') if response.ok else None
+    
+    def _load_cache(self, path: Path) -> Any:
+        """Read a derived cache file (msgpack when available, else JSON)"""
+        raw = path.read_bytes()
+        if MSGPACK_AVAILABLE:
+            return msgpack.unpackb(raw, raw=False)
+        return _json_loads(raw)
+    
+    def _save_cache(self, path: Path, data: Any) -> bool:
+        """Atomically write a derived cache file (msgpack when available, else JSON)"""
+        payload = msgpack.packb(data, use_bin_type=True) if MSGPACK_AVAILABLE else _json_dumps(data)
+        return atomic_file_write(path, payload)
+    
+    def get_new_commits(self, max_count: int = 50, include_stats: bool = False) -> List[Dict[str, Any]]:
+        """Get commits since last processed commit
+        
+        include_stats makes the REST fallback fetch each commit's files and
+        stats (one extra GET per commit). The GraphQL path always carries
+        line stats, since they come with the same query.
+        """
+        if not self._ensure_connected():
             return []
         
         print(f"\n📊 Fetching new commits from {self.repo_name}...")
@@ -130,21 +341,16 @@ class GitHubRepoTracker:
         commits_data = []
         
         try:
-            # Get commits since last processed
-            if self.state.last_commit_sha:
-                # Get commits since specific SHA
-                all_commits = self.repo.get_commits()
-                for commit in all_commits:
-                    if commit.sha == self.state.last_commit_sha:
-                        break
-                    commits_data.append(self._extract_commit_info(commit))
-                    if len(commits_data) >= max_count:
-                        break
-            else:
-                # First run - get recent commits
-                commits = self.repo.get_commits()[:max_count]
-                for commit in commits:
-                    commits_data.append(self._extract_commit_info(commit))
+            # A 304 on the list head means nothing new (and costs no rate limit)
+            not_modified, etag = self._probe_list('commits', self.state.commits_etag)
+            if not_modified:
+                print("✓ Found 0 new commits (not modified)")
+                return []
+            
+            # One GraphQL query when possible, REST walk otherwise
+            commits_data = self._fetch_commits_graphql(max_count)
+            if commits_data is None:
+                commits_data = self._fetch_commits_rest(max_count, include_stats)
             
             print(f"✓ Found {len(commits_data)} new commits")
             
@@ -153,31 +359,135 @@ class GitHubRepoTracker:
                 self.state.last_commit_sha = commits_data[0]['sha']
                 self.state.last_commit_date = commits_data[0]['date']
                 self.state.total_commits_processed += len(commits_data)
+                self._dirty = True
+            if etag and etag != self.state.commits_etag:
+                self.state.commits_etag = etag
+                self._dirty = True
         
         except Exception as e:
             print(f"❌ Error fetching commits: {e}")
         
         return commits_data
     
-    def _extract_commit_info(self, commit) -> Dict[str, Any]:
-        """Extract relevant information from commit"""
+    def _fetch_commits_graphql(self, max_count: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch new commits via one GraphQL query; None means fall back to REST"""
+        # The GraphQL API requires authentication
+        if not self.github_token:
+            return None
+        
+        owner, name = self.repo_name.split('/', 1)
+        variables = {'owner': owner, 'name': name, 'first': min(max_count, 100)}
+        if self.state.last_commit_sha and self.state.last_commit_date:
+            variables['since'] = self.state.last_commit_date
+        
+        try:
+            response = self.session.post(
+                GITHUB_GRAPHQL_URL,
+                json={'query': COMMIT_HISTORY_QUERY, 'variables': variables},
+                timeout=30
+            )
+            response.raise_for_status()
+            payload = _json_loads(response.content)
+            if payload.get('errors'):
+                raise ValueError(payload['errors'][0].get('message', 'GraphQL error'))
+            nodes = payload['data']['repository']['defaultBranchRef']['target']['history']['nodes']
+        except Exception as e:
+            print(f"⚠️ GraphQL commit query failed, falling back to REST: {e}")
+            return None
+        
+        commits_data = []
+        for node in nodes:
+            # `since` is inclusive, so stop at the last processed commit
+            if node['oid'] == self.state.last_commit_sha:
+                break
+            commits_data.append(self._extract_graphql_commit_info(node))
+        return commits_data
+    
+    def _extract_graphql_commit_info(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL commit node to the _extract_commit_info shape"""
+        author = node.get('author') or {}
+        date = author.get('date')
+        if date:
+            # Normalize to UTC to match PyGithub's isoformat() output
+            date = datetime.fromisoformat(date.replace('Z', '+00:00')).astimezone(timezone.utc).isoformat()
+        additions = node.get('additions') or 0
+        deletions = node.get('deletions') or 0
         return {
+            'sha': node['oid'],
+            'date': date,
+            'author': author.get('name'),
+            'message': node['message'],
+            'url': node['url'],
+            # GraphQL doesn't expose per-commit file lists
+            'files_changed': [],
+            'stats': {
+                'additions': additions,
+                'deletions': deletions,
+                'total': additions + deletions
+            }
+        }
+    
+    def _fetch_commits_rest(self, max_count: int, include_stats: bool = False) -> List[Dict[str, Any]]:
+        """Fetch new commits by walking the REST commit list"""
+        new_commits = []
+        if self.state.last_commit_sha:
+            # Let the server cut the list at the last processed date instead
+            # of paging back through history; the SHA check stays as a guard
+            if self.state.last_commit_date:
+                all_commits = self.repo.get_commits(
+                    since=datetime.fromisoformat(self.state.last_commit_date)
+                )
+            else:
+                all_commits = self.repo.get_commits()
+            for commit in all_commits:
+                if commit.sha == self.state.last_commit_sha:
+                    break
+                new_commits.append(commit)
+                if len(new_commits) >= max_count:
+                    break
+        else:
+            # First run - get recent commits
+            new_commits = list(self.repo.get_commits()[:max_count])
+        
+        if not include_stats:
+            # List-endpoint fields only, no per-commit requests
+            return [self._extract_commit_info(commit) for commit in new_commits]
+        
+        # Files/stats are lazily fetched per commit (one GET each), so
+        # resolve them on a bounded pool; map() keeps newest-first order
+        with ThreadPoolExecutor(max_workers=COMMIT_DETAIL_WORKERS) as pool:
+            return list(pool.map(
+                lambda commit: self._extract_commit_info(commit, include_stats=True),
+                new_commits
+            ))
+    
+    def _extract_commit_info(self, commit, include_stats: bool = False) -> Dict[str, Any]:
+        """Extract relevant information from commit
+        
+        Files and stats aren't part of the list response; reading them makes
+        PyGithub GET the full commit, so they're only touched on request.
+        """
+        info = {
             'sha': commit.sha,
             'date': commit.commit.author.date.isoformat(),
             'author': commit.commit.author.name,
             'message': commit.commit.message,
             'url': commit.html_url,
-            'files_changed': [f.filename for f in commit.files] if commit.files else [],
-            'stats': {
+            'files_changed': [],
+            'stats': {'additions': 0, 'deletions': 0, 'total': 0}
+        }
+        if include_stats:
+            info['files_changed'] = [f.filename for f in commit.files] if commit.files else []
+            info['stats'] = {
                 'additions': commit.stats.additions if commit.stats else 0,
                 'deletions': commit.stats.deletions if commit.stats else 0,
                 'total': commit.stats.total if commit.stats else 0
             }
-        }
+        return info
     
     def get_new_releases(self) -> List[Dict[str, Any]]:
         """Get releases since last processed release"""
-        if not self.repo:
+        if not self._ensure_connected():
             return []
         
         print(f"\n🎉 Fetching new releases from {self.repo_name}...")
@@ -185,6 +495,11 @@ class GitHubRepoTracker:
         releases_data = []
         
         try:
+            not_modified, etag = self._probe_list('releases', self.state.releases_etag)
+            if not_modified:
+                print("✓ Found 0 new releases (not modified)")
+                return []
+            
             all_releases = self.repo.get_releases()
             
             for release in all_releases:
@@ -201,6 +516,10 @@ class GitHubRepoTracker:
                 self.state.last_release_tag = releases_data[0]['tag']
                 self.state.last_release_date = releases_data[0]['published_at']
                 self.state.total_releases_processed += len(releases_data)
+                self._dirty = True
+            if etag and etag != self.state.releases_etag:
+                self.state.releases_etag = etag
+                self._dirty = True
         
         except Exception as e:
             print(f"❌ Error fetching releases: {e}")
@@ -218,14 +537,16 @@ class GitHubRepoTracker:
             'url': release.html_url,
             'is_prerelease': release.prerelease,
             'is_draft': release.draft,
+            # `assets` is embedded in the /releases list payload; get_assets()
+            # would re-request /releases/{id}/assets for every release
             'assets': [
                 {
                     'name': asset.name,
                     'download_url': asset.browser_download_url,
                     'size': asset.size
                 }
-                for asset in release.get_assets()
-            ] if release.get_assets() else []
+                for asset in release.assets or []
+            ]
         }
     
     def analyze_commits_for_changes(self, commits: List[Dict[str, Any]]) -> Dict[str, List[str]]:
@@ -239,71 +560,92 @@ class GitHubRepoTracker:
             'other': []
         }
         
-        # Keywords for categorization
-        keywords = {
-            'features': ['feat', 'feature', 'add', 'implement', 'new'],
-            'bug_fixes': ['fix', 'bug', 'issue', 'resolve', 'patch'],
-            'breaking_changes': ['breaking', 'break', 'major', 'remove'],
-            'documentation': ['docs', 'doc', 'documentation', 'readme'],
-            'deprecations': ['deprecate', 'deprecated', 'obsolete']
-        }
-        
         for commit in commits:
-            message = commit['message'].lower()
-            categorized = False
+            # Categorize on the first line only; bodies (bot PRs, pasted
+            # changelogs) are long and mostly noise for keyword matching
+            headline = commit['message'].partition('\n')[0]
+            category = self._classify_message(headline)
             
-            for category, kw_list in keywords.items():
-                if any(kw in message for kw in kw_list):
-                    changes[category].append({
-                        'message': commit['message'].split('\n')[0],  # First line
-                        'sha': commit['sha'][:7],
-                        'date': commit['date'],
-                        'files': commit['files_changed']
-                    })
-                    categorized = True
-                    break
-            
-            if not categorized:
+            if category:
+                changes[category].append({
+                    'message': headline,
+                    'sha': commit['sha'][:7],
+                    'date': commit['date'],
+                    'files': commit['files_changed']
+                })
+            else:
                 changes['other'].append({
-                    'message': commit['message'].split('\n')[0],
+                    'message': headline,
                     'sha': commit['sha'][:7]
                 })
         
         return changes
     
+    def _classify_message(self, message: str) -> Optional[str]:
+        """Return the highest-priority category with a keyword in message"""
+        if self._CATEGORY_AUTOMATON is None:
+            match = self._CATEGORY_RE.match(message)
+            return match.lastgroup if match else None
+        
+        # One pass over the text regardless of keyword count; keep the best
+        # (lowest) priority seen and stop early on the top category
+        best = None
+        for _, (priority, category) in self._CATEGORY_AUTOMATON.iter(message.lower()):
+            if best is None or priority < best[0]:
+                best = (priority, category)
+                if priority == 0:
+                    break
+        return best[1] if best else None
+    
     def get_changelog_entries(self) -> Dict[str, Any]:
         """Extract structured changelog entries"""
-        if not self.repo:
+        if not self._ensure_connected():
             return {}
         
         try:
             # Try to get CHANGELOG.md
             changelog_content = self.repo.get_contents("CHANGELOG.md")
-            changelog_text = changelog_content.decoded_content.decode('utf-8')
             
-            return self._parse_changelog(changelog_text)
-        except:
+            # Same blob as last time - reuse the cached parse
+            if changelog_content.sha == self.state.changelog_sha and self.changelog_cache_file.exists():
+                try:
+                    return self._load_cache(self.changelog_cache_file)
+                except Exception as e:
+                    print(f"⚠️ Failed to load changelog cache: {e}")
+            
+            changelog_text = changelog_content.decoded_content.decode('utf-8')
+            entries = self._parse_changelog(changelog_text)
+        except Exception:
             return {}
+        
+        # A failed cache write only costs a re-parse next run; the entries
+        # parsed above are still returned
+        if self._save_cache(self.changelog_cache_file, entries):
+            self.state.changelog_sha = changelog_content.sha
+            self._dirty = True
+        else:
+            print(f"⚠️ Failed to write changelog cache: {self.changelog_cache_file}")
+        
+        return entries
     
     def _parse_changelog(self, text: str) -> Dict[str, Any]:
         """Parse changelog markdown into structured data"""
         entries = {}
+        
+        # Detect version headers (e.g., ## [1.0.0] - 2024-01-01) by offset and
+        # slice each body straight out of the original text. Matches are
+        # consumed lazily; only the previous header is held at any time.
         current_version = None
-        current_content = []
-        
-        for line in text.split('\n'):
-            # Detect version headers (e.g., ## [1.0.0] - 2024-01-01)
-            if line.startswith('## '):
-                if current_version:
-                    entries[current_version] = '\n'.join(current_content)
-                current_version = line.replace('##', '').strip()
-                current_content = []
-            elif current_version:
-                current_content.append(line)
+        body_start = 0
+        for match in CHANGELOG_HEADER_RE.finditer(text):
+            if current_version:
+                entries[current_version] = text[body_start:match.start() - 1]
+            current_version = match.group().replace('##', '').strip()
+            body_start = match.end() + 1
         
         # Add last version
         if current_version:
-            entries[current_version] = '\n'.join(current_content)
+            entries[current_version] = text[body_start:]
         
         return entries
     
@@ -311,12 +653,13 @@ class GitHubRepoTracker:
         """Initialize repository state from scratch"""
         print(f"\n🚀 Initializing repository state for {self.repo_name}...")
         
-        # Get all releases
-        releases = self.get_new_releases()
+        # Releases and commits are independent endpoints; fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            releases_future = pool.submit(self.get_new_releases)
+            commits_future = pool.submit(self.get_new_commits, max_count=100, include_stats=True)
+            releases = releases_future.result()
+            commits = commits_future.result()
         print(f"✓ Loaded {len(releases)} releases")
-        
-        # Get recent commits
-        commits = self.get_new_commits(max_count=100)
         print(f"✓ Loaded {len(commits)} recent commits")
         
         # Save initial state
@@ -330,6 +673,10 @@ class GitHubRepoTracker:
     
     def get_incremental_updates(self) -> Dict[str, Any]:
         """Get updates since last run (incremental)"""
+        if self._last_update and time.monotonic() - self._last_update[0] < self.poll_ttl:
+            # Callers get their own copy, so mutating one can't corrupt the next
+            return copy.deepcopy(self._last_update[1])
+        
         print(f"\n🔄 Checking for updates since last run...")
         
         updates = {
@@ -340,23 +687,27 @@ class GitHubRepoTracker:
             'last_state': self.state.to_dict()
         }
         
-        # Get new commits
-        new_commits = self.get_new_commits()
+        # Commits and releases are independent endpoints; fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            commits_future = pool.submit(self.get_new_commits)
+            releases_future = pool.submit(self.get_new_releases)
+            new_commits = commits_future.result()
+            new_releases = releases_future.result()
+        
         if new_commits:
             updates['has_updates'] = True
             updates['new_commits'] = new_commits
             updates['commit_analysis'] = self.analyze_commits_for_changes(new_commits)
         
-        # Get new releases
-        new_releases = self.get_new_releases()
         if new_releases:
             updates['has_updates'] = True
             updates['new_releases'] = new_releases
         
-        # Save updated state
-        if updates['has_updates']:
-            self.save_state()
+        # Save updated state (no-op unless something changed, e.g. a new ETag)
+        self.save_state()
         
+        if self.poll_ttl > 0:
+            self._last_update = (time.monotonic(), copy.deepcopy(updates))
         return updates
     
     def get_summary(self) -> str:
@@ -400,6 +751,7 @@ def main():
         else:
             print("\n✓ No updates since last run")
     
+    tracker.close()
     print(tracker.get_summary())
 
 
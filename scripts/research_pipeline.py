@@ -7,15 +7,25 @@ information about BrowserOS Workflows from various sources.
 Now includes direct GitHub repository tracking for intelligent incremental updates.
 """
 
+import io
 import os
+import re
 import sys
 import json
-import requests
+import time
+import functools
+import threading
+import contextlib
+import inspect
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from dotenv import load_dotenv
 from datetime import datetime
 from utils.resilience import (
     ResilientLogger, retry_with_backoff, validate_api_key,
-    resilient_request, validate_url, safe_file_write, safe_file_read
+    resilient_request, validate_url, safe_file_read,
+    atomic_file_write
 )
 
 # Force UTF-8 encoding for Windows console
@@ -27,19 +37,40 @@ if sys.platform == "win32":
 load_dotenv()
 
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import hashlib
+import gzip
+import heapq
 
-# Initialize logger
-logger = ResilientLogger(__name__)
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _json_body(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+    def _json_body(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
-# Add repo tracker
 try:
-    from repo_tracker import GitHubRepoTracker
-    TRACKER_AVAILABLE = True
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    SELECTOLAX_AVAILABLE = True
 except ImportError:
-    TRACKER_AVAILABLE = False
-    logger.warn("repo_tracker not available")
+    SELECTOLAX_AVAILABLE = False
+
+# Initialize logger
+logger = ResilientLogger(__name__)
+
+if TYPE_CHECKING:
+    import requests
 
 # Load configuration via config_loader (with env var fallback)
 try:
@@ -60,6 +91,8 @@ SOURCES_PATH = REPO_ROOT / "BrowserOS" / "Research" / "sources.json"
 RAW_DIR = REPO_ROOT / "BrowserOS" / "Research" / "raw"
 BROWSEROS_REPO = RAW_DIR / "browseros-ai-BrowserOS"
 REPO_STATE_PATH = REPO_ROOT / "BrowserOS" / "Research" / "repo_state.json"
+LLM_CACHE_PATH = REPO_ROOT / "BrowserOS" / "Research" / ".llm_cache.json"
+FINDINGS_DIGEST_PATH = REPO_ROOT / "BrowserOS" / "Research" / ".last_findings"
 
 # API Configuration (config_loader values take precedence, env vars as fallback)
 OLLAMA_API_KEY = _ollama_cfg.get("api_key") or os.getenv("OLLAMA_API_KEY")
@@ -67,6 +100,68 @@ OPENROUTER_API_KEY = _openrouter_cfg.get("api_key") or os.getenv("OPENROUTER_API
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 FORCE_UPDATE = os.getenv("FORCE_UPDATE", "false").lower() == "true"
 
+# Upper bound on concurrent LLM requests issued by AIResearcher.query_many
+AI_MAX_WORKERS = 8
+# Bytes of a failed completion's response body kept for the error log
+AI_ERROR_BODY_MAX_BYTES = 16 * 1024
+
+# Characters of each web source kept for synthesis, and the streamed
+# download chunk size used when archiving them
+WEB_SNIPPET_CHARS = 5000
+REPO_SNIPPET_CHARS = 10000
+ARCHIVE_CHUNK_SIZE = 64 * 1024
+# Bodies beyond this are not downloaded; only the head is ever used
+ARCHIVE_MAX_BYTES = 256 * 1024
+
+# Web sources researched per run, and how many are fetched at once
+# (kept within the archiver's 16-connection pool)
+WEB_SOURCE_LIMIT = 6
+WEB_FETCH_WORKERS = 6
+
+# Weight of a source's "priority" label when choosing which sources to
+# research; unlabelled sources count as medium
+SOURCE_PRIORITY_WEIGHTS = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+# Each consecutive fetch failure halves a source's score, up to this many times
+SOURCE_FAILURE_BACKOFF_MAX = 5
+
+# Per-host politeness for source fetches: in-flight cap for every host, plus
+# a request-rate ceiling (requests/second) for hosts with published limits
+HOST_MAX_CONCURRENCY = 4
+HOST_RATE_LIMITS = {"api.github.com": 5.0}
+# Longest Retry-After honoured on a 429 before handing over to the retry backoff
+RETRY_AFTER_MAX = 30.0
+
+# Archives are gzip-compressed on disk; HTML typically shrinks 5-8x
+ARCHIVE_SUFFIX = ".html.gz"
+ARCHIVE_GZIP_LEVEL = 6
+# Marker left in RAW_DIR once plain .html archives have been compressed
+ARCHIVE_REPACK_MARKER = ".repacked"
+
+# Archives whose server sent no ETag/Last-Modified are reused for this long
+# instead of refetched; archives with validators are revalidated every run
+ARCHIVE_CACHE_TTL = 7 * 86400
+
+# Client-side cap on in-flight requests per provider. Local Ollama works
+# through its queue sequentially, so letting more through only adds latency.
+PROVIDER_CONCURRENCY = {"openrouter": 10, "ollama": 2}
+
+# Trailing slice of the KB checked for today's update marker before the
+# whole document is read
+KB_TAIL_BYTES = 64 * 1024
+
+# Token budget for the research summary sent to the LLM, and the order in
+# which sections keep their share of it (lowest-signal last, trimmed first)
+SUMMARY_TOKEN_BUDGET = 3000
+SUMMARY_PRIORITY = ("github", "repo", "web")
+
+# License heading the auto-generated updates are inserted before (the KB
+# uses "### License"); anchored to line start so prose mentions don't match
+LICENSE_HEADING = re.compile(r'^#{2,3} License\b', re.MULTILINE)
+
+# Identical prompts within this window are answered from LLM_CACHE_PATH
+LLM_CACHE_TTL = 24 * 3600
+LLM_CACHE_MAX_ENTRIES = 256
+
 # Validate API keys (allow placeholders since they're optional)
 try:
     if OLLAMA_API_KEY:
@@ -81,6 +176,295 @@ except ValueError as e:
     logger.warn(f"OPENROUTER_API_KEY validation warning: {e}")
 
 
+def _pooled_session(pool_connections: int, pool_maxsize: int, **adapter_kwargs) -> "requests.Session":
+    """Create a requests.Session whose connection pool is sized for its callers.
+    
+    requests is imported on first use rather than at module load, so
+    importing this module stays cheap for callers that never hit the network.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, **adapter_kwargs
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Elements whose text is code or site chrome rather than page content
+_BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside']
+
+
+def _visible_text(html: str) -> str:
+    """Extract readable text from HTML, dropping markup, scripts and chrome.
+    
+    Uses selectolax when installed, otherwise BeautifulSoup; returns "" if
+    neither can parse the page so callers can fall back to the raw head.
+    """
+    try:
+        if SELECTOLAX_AVAILABLE:
+            tree = HTMLParser(html)
+            tree.strip_tags(_BOILERPLATE_TAGS)
+            node = tree.body or tree.root
+            return node.text(separator=' ', strip=True) if node else ""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in soup(_BOILERPLATE_TAGS):
+            tag.decompose()
+        return soup.get_text(' ', strip=True)
+    except Exception as e:
+        logger.debug("HTML text extraction failed: %s", e)
+        return ""
+
+
+class _RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per second"""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+def _retry_after_seconds(value: Optional[str]) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP date), capped at RETRY_AFTER_MAX"""
+    if not value:
+        return 0.0
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return 0.0
+    return max(0.0, min(delay, RETRY_AFTER_MAX))
+
+
+def _read_tail(path: Path, size: int) -> bytes:
+    """Return the last size bytes of a file (all of it if smaller)"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - size))
+            return f.read()
+    except OSError:
+        return b""
+
+
+@functools.lru_cache(maxsize=1024)
+def _url_hash(url: str) -> str:
+    """Archive key for a URL.
+    
+    The key only names a file, so a 128-bit BLAKE2b digest is plenty and
+    cheaper than SHA-256; results are shared by every archiver in the process.
+    """
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+
+def _findings_digest(repo_findings: Dict[str, str], web_snippets: Dict[str, str]) -> str:
+    """Fingerprint of the repo findings and archived web snippets, compared across runs"""
+    payload = _json_body({"repo": repo_findings, "web": web_snippets})
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _read_text_head(path: Path, max_chars: int) -> str:
+    """Decode at most max_chars from the start of a UTF-8 file.
+    
+    Reads only the bytes that can hold max_chars (4 per character at most)
+    instead of loading the whole file just to slice it.
+    """
+    limit = max_chars * 4
+    chunks = []
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        while limit > 0:
+            chunk = os.read(fd, limit)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            limit -= len(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks).decode('utf-8', errors='ignore')[:max_chars]
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_text_head(path: str, mtime_ns: int, size: int, max_chars: int) -> str:
+    """_read_text_head memoized on (path, mtime, size), so a file that has
+    not changed since the last call is neither re-read nor re-decoded."""
+    return _read_text_head(Path(path), max_chars)
+
+
+def _scan_files(root: Path, rel_paths: List[str]) -> set:
+    """Return the subset of rel_paths that are regular files under root.
+    
+    Lists each parent directory once with os.scandir instead of stat()ing
+    every candidate; a missing directory simply contributes nothing.
+    """
+    by_dir: Dict[str, set] = {}
+    for rel in rel_paths:
+        parent, _, name = rel.rpartition('/')
+        by_dir.setdefault(parent, set()).add(name)
+    
+    found = set()
+    for parent, names in by_dir.items():
+        try:
+            with os.scandir(root / parent if parent else root) as entries:
+                for entry in entries:
+                    if entry.name in names and entry.is_file():
+                        found.add(f"{parent}/{entry.name}" if parent else entry.name)
+        except OSError:
+            continue
+    return found
+
+
+_SYNTHESIS_PROMPT = """Analyze these research findings about BrowserOS Workflows and identify:
+1. New features or capabilities discovered
+2. Updates to existing documentation
+3. Important changes or deprecations (from commits and releases)
+4. Security considerations
+5. Best practices and patterns
+
+Research Summary:
+{summary}
+
+Provide a concise summary of key findings that should update the knowledge base."""
+
+
+def _completion_text(body: Any) -> str:
+    """Pull the first choice's message content out of a chat-completion body"""
+    try:
+        return body["choices"][0]["message"]["content"] or ""
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+
+class QueryCancelled(Exception):
+    """An LLM query was abandoned because another provider already answered"""
+
+
+def _check_cancel(cancel: Optional[threading.Event]):
+    if cancel is not None and cancel.is_set():
+        raise QueryCancelled("query cancelled")
+
+
+def _read_completion(response: "requests.Response", cancel: Optional[threading.Event] = None) -> str:
+    """Read a chat completion, consuming SSE deltas as they arrive.
+    
+    Falls back to the buffered JSON body when the provider ignored
+    "stream": true. Raises QueryCancelled once cancel is set, rather than
+    returning a partial answer.
+    """
+    if "text/event-stream" not in response.headers.get("Content-Type", ""):
+        return _completion_text(_json_loads(response.content))
+    
+    parts = []
+    for line in response.iter_lines():
+        _check_cancel(cancel)
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            break
+        choices = _json_loads(data).get("choices") or []
+        delta = choices[0].get("delta", {}).get("content") if choices else None
+        if delta:
+            parts.append(delta)
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _token_encoder():
+    """Return a tiktoken encoder, or None to fall back to a ~4 chars/token estimate"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    enc = _token_encoder()
+    return len(enc.encode(text)) if enc else len(text) // 4
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text at a token boundary so it fits in max_tokens"""
+    if max_tokens <= 0:
+        return ""
+    enc = _token_encoder()
+    if enc is None:
+        return text[:max_tokens * 4]
+    tokens = enc.encode(text)
+    return text if len(tokens) <= max_tokens else enc.decode(tokens[:max_tokens])
+
+
+def _fit_to_token_budget(sections: Dict[str, str], priority: tuple, budget: int) -> Dict[str, str]:
+    """Give each section, in priority order, as much of budget as it needs.
+    
+    Later sections get whatever is left and are truncated (or emptied) first.
+    """
+    fitted = {}
+    remaining = budget
+    for name in priority:
+        text = sections.get(name, "")
+        tokens = _count_tokens(text)
+        if tokens > remaining:
+            text = _truncate_tokens(text, remaining)
+            tokens = remaining
+        fitted[name] = text
+        remaining -= tokens
+    return fitted
+
+
+def _llm_cached(func):
+    """Memoize an AIResearcher query method on (method, model, prompt) for LLM_CACHE_TTL.
+    
+    Sits outside retry_with_backoff so a cache hit skips the request entirely;
+    failures are never cached. FORCE_UPDATE bypasses lookups. Arguments are
+    bound against the signature with defaults applied, so the default model
+    is part of the key too.
+    """
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    def wrapper(self, prompt: str, *args, cancel: Optional[threading.Event] = None, **kwargs):
+        bound = signature.bind(self, prompt, *args, **kwargs)
+        bound.apply_defaults()
+        params = sorted(
+            (name, value) for name, value in bound.arguments.items()
+            if name not in ("self", "cancel")
+        )
+        key_src = f"{func.__name__}|{params}"
+        key = hashlib.sha256(key_src.encode("utf-8")).hexdigest()
+        if not FORCE_UPDATE:
+            hit = self._cache_get(key)
+            if hit is not None:
+                logger.info("%s: using cached response", func.__name__)
+                return hit
+        content = func(self, prompt, *args, cancel=cancel, **kwargs)
+        self._cache_put(key, content)
+        return content
+    return wrapper
+
+
 class AIResearcher:
     """AI-powered research assistant using Ollama and OpenRouter"""
     
@@ -89,11 +473,154 @@ class AIResearcher:
         self.ollama_url = "http://localhost:11434/v1/chat/completions"
         self.openrouter_url = "https://openrouter.ai/api/v1/chat/completions"
         logger.info(f"OpenRouter URL: {self.openrouter_url}")
-        self.session = requests.Session()
+        # Size the pool so query_many() workers never wait on a free connection
+        self.session = _pooled_session(2, AI_MAX_WORKERS)
+        self._limits = {
+            name: threading.BoundedSemaphore(size)
+            for name, size in PROVIDER_CONCURRENCY.items()
+        }
+        self._cache_lock = threading.Lock()
+        self._cache = self._load_cache()
+        self._cache_dirty = False
+    
+    def close(self):
+        """Flush the LLM cache and release pooled keep-alive connections"""
+        self.flush_cache()
+        self.session.close()
+    
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load unexpired LLM responses persisted by earlier runs"""
+        if not LLM_CACHE_PATH.exists():
+            return {}
+        try:
+            entries = _json_loads(LLM_CACHE_PATH.read_bytes() or b"{}")
+        except (OSError, ValueError) as e:
+            logger.warn(f"Ignoring unreadable LLM cache: {e}")
+            return {}
+        cutoff = time.time() - LLM_CACHE_TTL
+        return {k: v for k, v in entries.items() if v.get("ts", 0) >= cutoff}
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry and entry["ts"] >= time.time() - LLM_CACHE_TTL:
+            return entry["content"]
+        return None
+    
+    def _cache_put(self, key: str, content: str):
+        """Record a response in memory; flush_cache() persists it"""
+        with self._cache_lock:
+            self._cache[key] = {"ts": time.time(), "content": content}
+            if len(self._cache) > LLM_CACHE_MAX_ENTRIES:
+                # Evict oldest entries first
+                newest = sorted(self._cache.items(), key=lambda kv: kv[1]["ts"])
+                self._cache = dict(newest[-LLM_CACHE_MAX_ENTRIES:])
+            self._cache_dirty = True
     
-    @retry_with_backoff(max_attempts=3, base_delay=2.0)
-    def query_ollama(self, prompt: str, model: str = "llama3") -> str:
+    def flush_cache(self) -> bool:
+        """Write the LLM cache to disk if anything was added since the last flush"""
+        # Snapshot and write under the lock so a concurrent put can't be
+        # dropped between serialising and clearing the dirty flag
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return True
+            if atomic_file_write(LLM_CACHE_PATH, _json_dumps(self._cache), logger=logger):
+                self._cache_dirty = False
+                return True
+            return False
+    
+    @staticmethod
+    def _provider_for(url: str) -> str:
+        """Map an endpoint URL to its PROVIDER_CONCURRENCY key"""
+        return "openrouter" if "openrouter.ai" in url else "ollama"
+    
+    def _complete(self, url: str, cancel: Optional[threading.Event] = None, **kwargs) -> str:
+        """POST a streamed chat completion through the provider's concurrency
+        gate and return its text.
+        
+        With streaming the timeout applies between chunks, so a long
+        generation that keeps producing tokens is not cut off.
+        """
+        with self._limits[self._provider_for(url)]:
+            response = self.session.post(url, stream=True, **kwargs)
+            try:
+                if not response.ok:
+                    # Buffer the head of the error body so e.response.text can
+                    # still be logged after close, without reading an
+                    # arbitrarily large (or never-ending) body to the end
+                    head = bytearray()
+                    for chunk in response.iter_content(chunk_size=4096):
+                        head += chunk
+                        if len(head) >= AI_ERROR_BODY_MAX_BYTES:
+                            break
+                    response._content = bytes(head[:AI_ERROR_BODY_MAX_BYTES])
+                response.raise_for_status()
+                return _read_completion(response, cancel)
+            finally:
+                response.close()
+    
+    def query_first(self, prompt: str) -> tuple:
+        """Race OpenRouter and Ollama on one prompt; return (provider, content).
+        
+        The first provider to answer wins, so a slow-failing provider no
+        longer delays the other by its full timeout. The loser is cancelled
+        at its next streamed chunk or retry attempt, so it can't hold up
+        process exit either. Returns (None, None) when both fail.
+        """
+        providers = {"OpenRouter": self.query_openrouter, "Ollama": self.query_ollama}
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(providers))
+        try:
+            pending = {
+                executor.submit(query, prompt, cancel=cancel): name
+                for name, query in providers.items()
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        logger.warn("%s synthesis failed: %s", name, e)
+                        continue
+                    if content:
+                        return name, content
+            return None, None
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.flush_cache()
+    
+    def query_many(self, prompts: List[str], provider: str = "openrouter", **kwargs) -> List[Any]:
+        """Run several prompts against one provider concurrently.
+        
+        Results are returned in prompt order; a prompt that failed after
+        retries yields its exception instead of a string.
+        """
+        query = self.query_openrouter if provider == "openrouter" else self.query_ollama
+        
+        def _run(prompt: str) -> Any:
+            try:
+                return query(prompt, **kwargs)
+            except Exception as e:
+                return e
+        
+        try:
+            if len(prompts) <= 1:
+                return [_run(p) for p in prompts]
+            
+            with ThreadPoolExecutor(max_workers=min(AI_MAX_WORKERS, len(prompts))) as pool:
+                return list(pool.map(_run, prompts))
+        finally:
+            self.flush_cache()
+    
+    @_llm_cached
+    @retry_with_backoff(max_attempts=3, base_delay=2.0, jitter=1.0, giveup_on=(QueryCancelled,))
+    def query_ollama(self, prompt: str, model: str = "llama3",
+                     cancel: Optional[threading.Event] = None) -> str:
         """Query Ollama API for research"""
+        _check_cancel(cancel)
         # For local Ollama, we don't strictly need a key, even if env var has a placeholder
         
         try:
@@ -109,30 +636,33 @@ class AIResearcher:
                 "model": model,
                 "messages": [{"role": "user", "content": prompt}],
                 "temperature": 0.7,
-                "max_tokens": 2000
+                "max_tokens": 2000,
+                "stream": True
             }
             
-            response = self.session.post(
-                self.ollama_url, 
+            content = self._complete(
+                self.ollama_url,
                 headers=headers, 
-                json=data,
-                timeout=60
+                data=_json_body(data),
+                timeout=60,
+                cancel=cancel
             )
-            response.raise_for_status()
-            
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
             if not content:
                 raise ValueError("Empty response from Ollama API")
             return content
         
+        except QueryCancelled:
+            raise
         except Exception as e:
-            logger.error(f"Ollama API error: {e}")
+            logger.error("Ollama API error: %s", e)
             raise
     
-    @retry_with_backoff(max_attempts=3, base_delay=2.0)
-    def query_openrouter(self, prompt: str, model: str = "x-ai/grok-4.1-fast") -> str:
+    @_llm_cached
+    @retry_with_backoff(max_attempts=3, base_delay=2.0, jitter=1.0, giveup_on=(QueryCancelled,))
+    def query_openrouter(self, prompt: str, model: str = "x-ai/grok-4.1-fast",
+                         cancel: Optional[threading.Event] = None) -> str:
         """Query OpenRouter API for enhanced research"""
+        _check_cancel(cancel)
         if not OPENROUTER_API_KEY or "your-openrouter-api-key" in OPENROUTER_API_KEY:
             logger.warn("OpenRouter API key not configured, skipping...")
             raise ValueError("OpenRouter API key not configured")
@@ -149,29 +679,29 @@ class AIResearcher:
                 "model": model,
                 "messages": [{"role": "user", "content": prompt}],
                 "temperature": 0.7,
-                "max_tokens": 4000
+                "max_tokens": 4000,
+                "stream": True
             }
             
-            response = self.session.post(
+            content = self._complete(
                 self.openrouter_url,
                 headers=headers,
-                json=data,
-                timeout=120
+                data=_json_body(data),
+                timeout=120,
+                cancel=cancel
             )
-            response.raise_for_status()
-            
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
             if not content:
                 raise ValueError("Empty response from OpenRouter API")
             return content
         
+        except QueryCancelled:
+            raise
         except Exception as e:
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"OpenRouter API error: {e}")
-                logger.error(f"Response body: {e.response.text}")
+                logger.error("OpenRouter API error: %s", e)
+                logger.error("Response body: %s", e.response.text)
             else:
-                logger.error(f"OpenRouter API error: {e}")
+                logger.error("OpenRouter API error: %s", e)
             raise
 
 
@@ -181,49 +711,299 @@ class SourceArchiver:
     def __init__(self):
         self.raw_dir = RAW_DIR
         self.raw_dir.mkdir(parents=True, exist_ok=True)
+        # One pooled session so repeat hosts (github.com, docs sites) reuse
+        # their TCP+TLS connection instead of handshaking per URL
+        self.session = _pooled_session(16, max(16, WEB_FETCH_WORKERS), max_retries=0)
+        self.session.headers.update({
+            'User-Agent': 'BrowserOS-KB-Bot/1.0',
+            'Accept': 'text/html,application/xhtml+xml'
+        })
+        self._archive_paths: Dict[str, Path] = {}
+        self._host_lock = threading.Lock()
+        self._host_sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_limiters = {
+            host: _RateLimiter(rate) for host, rate in HOST_RATE_LIMITS.items()
+        }
+        self._repack_legacy_archives()
+    
+    @contextlib.contextmanager
+    def _host_gate(self, url: str):
+        """Hold a per-host concurrency slot (and rate token, if limited) for a request"""
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            sem = self._host_sems.get(host)
+            if sem is None:
+                sem = self._host_sems[host] = threading.BoundedSemaphore(HOST_MAX_CONCURRENCY)
+        with sem:
+            limiter = self._host_limiters.get(host)
+            if limiter:
+                limiter.acquire()
+            yield
+    
+    def _repack_legacy_archives(self):
+        """Compress archives left as plain .html by earlier versions, keeping mtimes.
+        
+        Runs once per archive directory; the marker file skips the scan afterwards.
+        """
+        marker = self.raw_dir / ARCHIVE_REPACK_MARKER
+        if marker.exists():
+            return
+        try:
+            with os.scandir(self.raw_dir) as entries:
+                legacy = [e.path for e in entries if e.name.endswith('.html') and e.is_file()]
+        except OSError:
+            return
+        failed = False
+        for path in legacy:
+            try:
+                st = os.stat(path)
+                with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb', compresslevel=ARCHIVE_GZIP_LEVEL) as dst:
+                    dst.write(src.read())
+                os.utime(path + '.gz', (st.st_atime, st.st_mtime))
+                os.unlink(path)
+            except OSError as e:
+                logger.warn("Could not repack %s: %s", path, e)
+                failed = True
+        if legacy:
+            logger.info("Compressed %d legacy archives", len(legacy))
+        if not failed:
+            atomic_file_write(marker, "", logger=logger)
+    
+    @staticmethod
+    def _sidecar(archive_path: Path, suffix: str) -> Path:
+        """Path of a sidecar (.meta, .snippet, .digest) next to an archive: <key><suffix>"""
+        return archive_path.with_name(archive_path.name.partition('.')[0] + suffix)
+    
+    def close(self):
+        """Release pooled keep-alive connections"""
+        self.session.close()
+    
+    def archive_path_for(self, url: str) -> Path:
+        """Return the archive file for a URL, memoized per archiver"""
+        path = self._archive_paths.get(url)
+        if path is None:
+            path = self._archive_paths[url] = self.raw_dir / f"{_url_hash(url)}{ARCHIVE_SUFFIX}"
+        return path
+    
+    @staticmethod
+    def _load_validators(meta_path: Path) -> Dict[str, Optional[str]]:
+        """Load the ETag/Last-Modified stored beside an archive, if any"""
+        try:
+            with open(meta_path, 'rb') as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    @classmethod
+    def _read_snippet(cls, archive_path: Path) -> str:
+        """Return the leading WEB_SNIPPET_CHARS of an archived page.
+        
+        Prefers the .snippet sidecar written at fetch time, which holds the
+        page's extracted text (or its decoded head for non-HTML bodies);
+        archives from before sidecars existed are decompressed and read as UTF-8.
+        """
+        snippet_path = cls._sidecar(archive_path, '.snippet')
+        if snippet_path.exists():
+            with open(snippet_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read(WEB_SNIPPET_CHARS)
+        with gzip.open(archive_path, 'rt', encoding='utf-8', errors='replace') as f:
+            return f.read(WEB_SNIPPET_CHARS)
+    
+    def archived_snippets(self, urls: List[str]) -> Dict[str, str]:
+        """Map each URL that has an archive to its stored snippet, without fetching"""
+        snippets = {}
+        for url in urls:
+            try:
+                snippets[url] = self._read_snippet(self.archive_path_for(url))
+            except OSError:
+                continue
+        return snippets
+    
+    def _stream_to_archive(self, response: "requests.Response", archive_path: Path,
+                           max_bytes: Optional[int] = ARCHIVE_MAX_BYTES) -> tuple:
+        """Compress a streamed response body, keeping only its head decoded.
+        
+        The body is hashed as it streams; when the digest matches the one
+        recorded for the current archive, nothing is written and only the
+        archive's mtime is refreshed. Otherwise the compressed body atomically
+        replaces archive_path, so an interrupted download never leaves a torn
+        archive. Reading stops after max_bytes (None archives the whole body).
+        
+        Returns (head, changed).
+        """
+        head = bytearray()
+        # UTF-8 needs at most 4 bytes per character
+        head_limit = WEB_SNIPPET_CHARS * 4
+        digest = hashlib.blake2b(digest_size=16)
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb', compresslevel=ARCHIVE_GZIP_LEVEL) as f:
+            written = 0
+            for chunk in response.iter_content(chunk_size=ARCHIVE_CHUNK_SIZE):
+                if max_bytes is not None and written + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - written]
+                f.write(chunk)
+                digest.update(chunk)
+                written += len(chunk)
+                if len(head) < head_limit:
+                    head += chunk[:head_limit - len(head)]
+                if max_bytes is not None and written >= max_bytes:
+                    break
+        
+        encoding = response.encoding or 'utf-8'
+        head_text = head.decode(encoding, errors='ignore')[:WEB_SNIPPET_CHARS]
+        
+        digest_path = self._sidecar(archive_path, '.digest')
+        hexdigest = digest.hexdigest()
+        if archive_path.exists() and safe_file_read(digest_path) == hexdigest:
+            os.utime(archive_path)
+            return head_text, False
+        if not atomic_file_write(archive_path, compressed.getbuffer(), logger=logger):
+            raise IOError(f"could not write {archive_path}")
+        atomic_file_write(digest_path, hexdigest, logger=logger)
+        return head_text, True
+    
+    def fetch_many(self, urls: List[str]) -> List[tuple]:
+        """Fetch and archive several URLs concurrently.
+        
+        Returns (url, content, error) tuples in input order; a URL that still
+        failed after retries carries its exception instead of content.
+        """
+        results: Dict[str, tuple] = {}
+        unique = list(dict.fromkeys(urls))
+        
+        # Serve fresh archives from one directory listing, without entering
+        # the retry-wrapped network path at all
+        if not FORCE_UPDATE:
+            index = self._load_cache_index()
+            cutoff = time.time() - ARCHIVE_CACHE_TTL
+            for url in unique:
+                if index.get(_url_hash(url), 0) >= cutoff and validate_url(url):
+                    logger.info("Using cached: %s", url)
+                    results[url] = (url, self._read_snippet(self.archive_path_for(url)), None)
+        
+        def _fetch(url: str) -> tuple:
+            try:
+                return url, self.fetch_and_archive(url), None
+            except Exception as e:
+                return url, None, e
+        
+        misses = [u for u in unique if u not in results]
+        if len(misses) <= 1:
+            results.update((u, _fetch(u)) for u in misses)
+        else:
+            with ThreadPoolExecutor(max_workers=min(WEB_FETCH_WORKERS, len(misses))) as pool:
+                results.update(zip(misses, pool.map(_fetch, misses)))
+        
+        return [results[u] for u in urls]
+    
+    def _load_cache_index(self) -> Dict[str, float]:
+        """Map archive key -> mtime for TTL-cached pages, in one scandir.
+        
+        Archives with a .meta sidecar are left out: a conditional GET tells
+        us cheaply whether they changed, so they are always revalidated.
+        """
+        archives: Dict[str, float] = {}
+        validated = set()
+        try:
+            with os.scandir(self.raw_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(ARCHIVE_SUFFIX) and entry.is_file():
+                        archives[name[:-len(ARCHIVE_SUFFIX)]] = entry.stat().st_mtime
+                    elif name.endswith('.meta'):
+                        validated.add(name[:-len('.meta')])
+        except OSError:
+            return {}
+        for key in validated:
+            archives.pop(key, None)
+        return archives
     
-    @retry_with_backoff(max_retries=3, base_delay=1.0)
-    def fetch_and_archive(self, url: str) -> str:
-        """Fetch URL content and archive it"""
+    @retry_with_backoff(max_attempts=3, base_delay=1.0, jitter=0.5)
+    def fetch_and_archive(self, url: str, max_bytes: Optional[int] = ARCHIVE_MAX_BYTES) -> str:
+        """Fetch URL content, archive it, and return its leading WEB_SNIPPET_CHARS"""
         try:
             # Validate URL before fetching
             if not validate_url(url):
-                logger.warn(f"Invalid URL format: {url}")
+                logger.warn("Invalid URL format: %s", url)
                 raise ValueError(f"Invalid URL format: {url}")
             
-            # Create hash for filename
-            url_hash = hashlib.sha256(url.encode()).hexdigest()
-            archive_path = self.raw_dir / f"{url_hash}.html"
+            archive_path = self.archive_path_for(url)
             
-            # Skip if recently archived (within 7 days)
-            if archive_path.exists():
-                age_days = (datetime.now().timestamp() - archive_path.stat().st_mtime) / 86400
-                if age_days < 7 and not FORCE_UPDATE:
-                    logger.info(f"Using cached: {url}")
-                    return safe_file_read(archive_path)
+            meta_path = self._sidecar(archive_path, '.meta')
+            validators = {}
+            if not FORCE_UPDATE:
+                try:
+                    mtime = os.stat(archive_path).st_mtime
+                except FileNotFoundError:
+                    mtime = None
+                if mtime is not None:
+                    validators = self._load_validators(meta_path)
+                    # Without validators fall back to the age heuristic
+                    if not validators and mtime >= time.time() - ARCHIVE_CACHE_TTL:
+                        logger.info("Using cached: %s", url)
+                        return self._read_snippet(archive_path)
             
             # Fetch fresh content
-            logger.info(f"Fetching: {url}")
-            headers = {
-                'User-Agent': 'BrowserOS-KB-Bot/1.0',
-                'Accept': 'text/html,application/xhtml+xml'
-            }
-            
+            logger.info("Fetching: %s", url)
+            headers = {}
             if GITHUB_TOKEN and 'github.com' in url:
                 headers['Authorization'] = f'token {GITHUB_TOKEN}'
             
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            # Revalidate an existing archive instead of re-downloading it;
+            # FORCE_UPDATE leaves validators empty so the page is refetched
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
             
-            # Archive content
-            content = response.text
-            safe_file_write(archive_path, content)
-            logger.info(f"Archived: {url}")
+            with self._host_gate(url), \
+                    self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+                if response.status_code == 429:
+                    # Honour the server's cooldown, then let retry_with_backoff retry
+                    delay = _retry_after_seconds(response.headers.get('Retry-After'))
+                    if delay:
+                        logger.warn("Rate limited by %s, waiting %.1fs", urlparse(url).netloc, delay)
+                        time.sleep(delay)
+                if response.status_code == 304:
+                    # Unchanged upstream: refresh the archive's age, no body transferred
+                    os.utime(archive_path)
+                    # A 304 may carry rotated validators; keep the newest ones
+                    refreshed = {
+                        'etag': response.headers.get('ETag') or validators.get('etag'),
+                        'last_modified': response.headers.get('Last-Modified') or validators.get('last_modified'),
+                    }
+                    if refreshed != validators:
+                        atomic_file_write(meta_path, _json_dumps(refreshed), logger=logger)
+                    logger.info("Not modified: %s", url)
+                    return self._read_snippet(archive_path)
+                response.raise_for_status()
+                
+                # Archive content without materialising the whole body
+                content, changed = self._stream_to_archive(response, archive_path, max_bytes)
+                if not changed:
+                    # Byte-identical body: the existing snippet is still valid
+                    content = self._read_snippet(archive_path)
+                elif 'html' in response.headers.get('Content-Type', 'text/html'):
+                    # Keep visible text rather than markup-heavy raw HTML
+                    with gzip.open(archive_path, 'rb') as f:
+                        html = f.read().decode(response.encoding or 'utf-8', errors='replace')
+                    content = _visible_text(html)[:WEB_SNIPPET_CHARS] or content
+                if changed:
+                    atomic_file_write(self._sidecar(archive_path, '.snippet'), content, logger=logger)
+                validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+            if any(validators.values()):
+                atomic_file_write(meta_path, _json_dumps(validators), logger=logger)
+            elif meta_path.exists():
+                meta_path.unlink()
+            logger.info("Archived: %s", url)
             
             return content
         
         except Exception as e:
-            logger.error(f"Failed to fetch {url}: {e}")
+            logger.error("Failed to fetch %s: %s", url, e)
             raise
 
 
@@ -234,10 +1014,17 @@ class KBResearcher:
         self.ai = AIResearcher()
         self.archiver = SourceArchiver()
         self.sources = self.load_sources()
+        self._sources_dirty = False
+        self._stamp_run()
         
-        # Initialize GitHub repo tracker
+        # Initialize GitHub repo tracker (imported here: it pulls in PyGithub)
         self.repo_tracker = None
-        if TRACKER_AVAILABLE:
+        try:
+            from repo_tracker import GitHubRepoTracker
+        except ImportError:
+            GitHubRepoTracker = None
+            logger.warn("repo_tracker not available")
+        if GitHubRepoTracker is not None:
             try:
                 self.repo_tracker = GitHubRepoTracker(
                     repo_name="browseros-ai/BrowserOS",
@@ -247,21 +1034,38 @@ class KBResearcher:
             except Exception as e:
                 logger.warn(f"Could not initialize repo tracker: {e}")
     
+    def close(self):
+        """Close HTTP sessions and flush pending tracker state writes"""
+        self.ai.close()
+        self.archiver.close()
+        if self.repo_tracker:
+            self.repo_tracker.close()
+    
+    def _stamp_run(self):
+        """Capture the run's clock once; every section and source shares it"""
+        self._now = datetime.now()
+        self._today = self._now.strftime('%Y-%m-%d')
+        self._now_iso = self._now.isoformat()
+    
     def load_sources(self) -> List[Dict[str, Any]]:
         """Load source manifest"""
         if not SOURCES_PATH.exists():
             return []
         try:
-            content = safe_file_read(SOURCES_PATH)
-            return json.loads(content)
+            with open(SOURCES_PATH, 'rb') as f:
+                return _json_loads(f.read())
         except Exception as e:
             logger.error(f"Failed to load sources from {SOURCES_PATH}: {e}")
             return []
     
     def save_sources(self):
-        """Save updated source manifest"""
+        """Save updated source manifest (no-op when nothing changed)"""
+        if not self._sources_dirty:
+            return
         try:
-            safe_file_write(SOURCES_PATH, json.dumps(self.sources, indent=2))
+            # Temp file + rename so a crash mid-write can't truncate the manifest
+            if atomic_file_write(SOURCES_PATH, _json_dumps(self.sources), logger=logger):
+                self._sources_dirty = False
         except Exception as e:
             logger.error(f"Failed to save sources to {SOURCES_PATH}: {e}")
             raise
@@ -284,35 +1088,70 @@ class KBResearcher:
             "CHANGELOG.md"
         ]
         
-        for file_path in key_files:
+        present = _scan_files(BROWSEROS_REPO, key_files)
+        
+        def _read_head(file_path: str):
+            if file_path not in present:
+                return file_path, None
             full_path = BROWSEROS_REPO / file_path
-            if full_path.exists():
-                try:
-                    logger.info(f"Reading {file_path}")
-                    content = safe_file_read(full_path)
-                    findings[file_path] = content[:10000]  # Limit size
-                except Exception as e:
-                    logger.error(f"Failed to read {file_path}: {e}")
+            try:
+                logger.info("Reading %s", file_path)
+                st = full_path.stat()
+                return file_path, _cached_text_head(
+                    str(full_path), st.st_mtime_ns, st.st_size, REPO_SNIPPET_CHARS
+                )
+            except Exception as e:
+                logger.error("Failed to read %s: %s", file_path, e)
+                return file_path, None
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for file_path, content in pool.map(_read_head, key_files):
+                if content is not None:
+                    findings[file_path] = content
         
         return findings
     
+    def _source_score(self, source: Dict[str, Any]) -> float:
+        """Priority weight times seconds since the source was last tried,
+        halved for every consecutive failure so a broken source can't keep
+        crowding out healthy ones"""
+        weight = SOURCE_PRIORITY_WEIGHTS.get(source.get('priority'), SOURCE_PRIORITY_WEIGHTS['medium'])
+        last_tried = 0.0  # Never (or unreadably) tried: most stale
+        for field in ('accessed', 'last_failed'):
+            try:
+                last_tried = max(last_tried, datetime.fromisoformat(source[field]).timestamp())
+            except (KeyError, TypeError, ValueError):
+                pass
+        backoff = 2 ** min(source.get('failures', 0), SOURCE_FAILURE_BACKOFF_MAX)
+        return weight * max(0.0, self._now.timestamp() - last_tried) / backoff
+    
     def research_from_web(self) -> Dict[str, str]:
         """Fetch and analyze web sources"""
         findings = {}
+        # Limit to avoid rate limits, picking the most important and stalest
+        # sources so every source gets its turn across runs
+        sources = heapq.nlargest(WEB_SOURCE_LIMIT, self.sources, key=self._source_score)
         
-        for source in self.sources[:6]:  # Limit to avoid rate limits
-            url = source['url']
-            try:
-                content = self.archiver.fetch_and_archive(url)
-                if content:
-                    # Extract key information (simplified extraction)
-                    findings[url] = content[:5000]
-                    
-                    # Update access timestamp
-                    source['accessed'] = datetime.now().isoformat()
-            except Exception as e:
-                logger.warn(f"Skipping source {url} due to error: {e}")
+        # Fetches are network-bound, so the archiver overlaps them
+        results = self.archiver.fetch_many([source['url'] for source in sources])
+        
+        for source, (url, content, error) in zip(sources, results):
+            if error is not None:
+                logger.warn("Skipping source %s due to error: %s", url, error)
+                # Push the source down the ranking until it recovers
+                source['last_failed'] = self._now_iso
+                source['failures'] = source.get('failures', 0) + 1
+                self._sources_dirty = True
                 continue
+            if content:
+                # Extract key information (simplified extraction)
+                findings[url] = content[:WEB_SNIPPET_CHARS]
+                
+                # Update access timestamp and clear any failure backoff
+                source['accessed'] = self._now_iso
+                source.pop('last_failed', None)
+                source.pop('failures', None)
+                self._sources_dirty = True
         
         self.save_sources()
         return findings
@@ -337,79 +1176,83 @@ class KBResearcher:
         """Use AI to synthesize findings into KB updates"""
         logger.info("Synthesizing knowledge base updates with AI...")
         
-        # Create research summary
-        summary = "# Research Findings Summary\n\n"
-        summary += f"## Repository Analysis ({len(repo_findings)} files)\n"
+        # Create research summary; each section is collected as parts and
+        # joined once so it can be budgeted independently. Sources share the
+        # budget (~4 chars/token) evenly, so later ones aren't cut off wholesale
+        per_source = SUMMARY_TOKEN_BUDGET * 4 // max(1, len(repo_findings) + len(web_findings))
+        repo_parts = [f"## Repository Analysis ({len(repo_findings)} files)\n"]
         for file, content in repo_findings.items():
-            summary += f"\n### {file}\n{content[:1000]}...\n"
+            repo_parts.append(f"\n### {file}\n{content[:per_source]}...\n")
         
         # Add GitHub updates if available
+        github_parts = []
         if github_updates and github_updates.get('has_updates'):
-            summary += f"\n## GitHub Repository Updates\n"
+            github_parts.append("\n## GitHub Repository Updates\n")
             
-            if github_updates.get('new_commits'):
-                summary += f"\n### New Commits ({len(github_updates['new_commits'])})\n"
-                for commit in github_updates['new_commits'][:10]:  # Limit to 10
-                    summary += f"- {commit['message'].split(chr(10))[0]} ({commit['sha'][:7]})\n"
+            new_commits = github_updates.get('new_commits')
+            if new_commits:
+                github_parts.append(f"\n### New Commits ({len(new_commits)})\n")
+                for commit in new_commits[:10]:  # Limit to 10
+                    github_parts.append(f"- {commit['message'].partition(chr(10))[0]} ({commit['sha'][:7]})\n")
                 
                 # Add commit analysis
-                if github_updates.get('commit_analysis'):
-                    summary += "\n### Changes by Category:\n"
-                    for category, items in github_updates['commit_analysis'].items():
+                analysis = github_updates.get('commit_analysis')
+                if analysis:
+                    github_parts.append("\n### Changes by Category:\n")
+                    for category, items in analysis.items():
                         if items:
-                            summary += f"- {category.title()}: {len(items)} commits\n"
+                            github_parts.append(f"- {category.title()}: {len(items)} commits\n")
             
-            if github_updates.get('new_releases'):
-                summary += f"\n### New Releases ({len(github_updates['new_releases'])})\n"
-                for release in github_updates['new_releases']:
-                    summary += f"- {release['name']} ({release['tag']}) - {release['published_at']}\n"
+            new_releases = github_updates.get('new_releases')
+            if new_releases:
+                github_parts.append(f"\n### New Releases ({len(new_releases)})\n")
+                for release in new_releases:
+                    github_parts.append(f"- {release['name']} ({release['tag']}) - {release['published_at']}\n")
                     if release['body']:
-                        summary += f"  {release['body'][:300]}...\n"
+                        github_parts.append(f"  {release['body'][:300]}...\n")
+        
+        web_parts = [f"\n## Web Sources ({len(web_findings)} sources)\n"]
+        for url, content in web_findings.items():
+            web_parts.append(f"\n### {url}\n{content[:per_source]}...\n")
         
-        summary += f"\n## Web Sources ({len(web_findings)} sources)\n"
-        for url in list(web_findings.keys())[:3]:
-            summary += f"\n### {url}\n{web_findings[url][:500]}...\n"
+        # Trim to the token budget, dropping lowest-signal sections first
+        fitted = _fit_to_token_budget(
+            {"repo": "".join(repo_parts), "github": "".join(github_parts), "web": "".join(web_parts)},
+            SUMMARY_PRIORITY,
+            SUMMARY_TOKEN_BUDGET,
+        )
+        summary = "# Research Findings Summary\n\n" + fitted["repo"] + fitted["github"] + fitted["web"]
+        logger.info("Research summary: ~%d tokens", _count_tokens(summary))
         
         # Use AI to generate insights
-        prompt = f"""Analyze these research findings about BrowserOS Workflows and identify:
-1. New features or capabilities discovered
-2. Updates to existing documentation
-3. Important changes or deprecations (from commits and releases)
-4. Security considerations
-5. Best practices and patterns
-
-Research Summary:
-{summary[:12000]}
-
-Provide a concise summary of key findings that should update the knowledge base."""
+        prompt = _SYNTHESIS_PROMPT.format(summary=summary)
         
-        # Try OpenRouter first (more capable), fallback to Ollama
-        insights = None
-        try:
-            insights = self.ai.query_openrouter(prompt)
-            logger.info("AI synthesis complete (OpenRouter)")
-        except Exception as e:
-            logger.warn(f"OpenRouter synthesis failed: {e}, trying Ollama...")
-            try:
-                insights = self.ai.query_ollama(prompt)
-                logger.info("AI synthesis complete (Ollama)")
-            except Exception as e2:
-                logger.error(f"Ollama synthesis also failed: {e2}")
+        # Query both providers at once and keep the first usable answer
+        provider, insights = self.ai.query_first(prompt)
         
         if insights:
+            logger.info("AI synthesis complete (%s)", provider)
             return insights
         else:
             logger.warn("AI synthesis unavailable, manual review needed")
             return None
     
-    def update_kb(self, insights: str) -> bool:
+    def update_kb(self, insights: str, today: Optional[str] = None) -> bool:
         """Update knowledge base with new insights"""
+        today = today or self._today
         if not KB_PATH.exists():
             logger.error("Knowledge base file not found")
             return False
         
         logger.info("Updating knowledge base...")
         
+        # Updates land just before the trailing license section, so today's
+        # marker is normally in the tail; check it before reading everything
+        marker_today = f"Auto-generated {today}"
+        if not FORCE_UPDATE and marker_today.encode('utf-8') in _read_tail(KB_PATH, KB_TAIL_BYTES):
+            logger.info("KB already updated today, skipping...")
+            return False
+        
         # Read current KB
         try:
             kb_content = safe_file_read(KB_PATH)
@@ -422,7 +1265,7 @@ Provide a concise summary of key findings that should update the knowledge base.
 
 ---
 
-## Latest Updates (Auto-generated {datetime.now().strftime('%Y-%m-%d')})
+## Latest Updates (Auto-generated {today})
 
 {insights}
 
@@ -432,20 +1275,32 @@ For the most current information, always refer to the official sources listed in
 """
         
         # Check if we need to update (avoid duplicate updates)
-        today = datetime.now().strftime('%Y-%m-%d')
-        if f"Auto-generated {today}" in kb_content and not FORCE_UPDATE:
+        if not FORCE_UPDATE and marker_today in kb_content:
             logger.info("KB already updated today, skipping...")
             return False
         
-        # Insert before license section
-        if "## License" in kb_content:
-            kb_content = kb_content.replace("## License", f"{update_section}\n## License")
-        else:
-            kb_content += update_section
+        # Insert before the last license heading; with no license section
+        # just append instead of rewriting the file
+        idx = -1
+        for match in LICENSE_HEADING.finditer(kb_content):
+            idx = match.start()
         
         # Write updated KB
         try:
-            safe_file_write(KB_PATH, kb_content)
+            if idx >= 0:
+                # Stream the three pieces into a temp file that replaces the
+                # KB, rather than building the whole new document in memory
+                written = atomic_file_write(
+                    KB_PATH,
+                    (kb_content[:idx], update_section + "\n", kb_content[idx:]),
+                    logger=logger,
+                )
+            else:
+                # Append by rewriting through a temp file as well, so a crash
+                # mid-write can't leave a torn KB
+                written = atomic_file_write(KB_PATH, (kb_content, update_section), logger=logger)
+            if not written:
+                raise IOError(f"could not write {KB_PATH}")
             logger.info("Knowledge base updated successfully")
             return True
         except Exception as e:
@@ -454,6 +1309,7 @@ For the most current information, always refer to the official sources listed in
     
     def run(self):
         """Execute full research pipeline with GitHub tracking"""
+        self._stamp_run()
         logger.info("=" * 60)
         logger.info("Starting AI-Powered KB Research Pipeline with GitHub Tracking")
         logger.info("=" * 60)
@@ -481,13 +1337,24 @@ For the most current information, always refer to the official sources listed in
         # Step 3: Research from web sources  
         web_findings = self.research_from_web()
         
+        # Fingerprint every archived source rather than this run's rotating
+        # subset, so the digest only changes when some source's content does
+        web_snippets = self.archiver.archived_snippets([source['url'] for source in self.sources])
+        findings_digest = _findings_digest(repo_findings, web_snippets)
+        # Nothing new to synthesize: skip the LLM round-trip entirely
+        if (not FORCE_UPDATE and not has_github_updates
+                and safe_file_read(FINDINGS_DIGEST_PATH).strip() == findings_digest):
+            logger.info("Research findings unchanged since last update, skipping AI synthesis")
+            return 0
+        
         # Step 4: Synthesize with AI (including GitHub updates)
         insights = self.synthesize_kb_updates(repo_findings, web_findings, github_updates)
         
         # Step 5: Update KB if we have insights
         if insights:
-            updated = self.update_kb(insights)
+            updated = self.update_kb(insights, self._today)
             if updated:
+                atomic_file_write(FINDINGS_DIGEST_PATH, findings_digest, logger=logger)
                 logger.info("Pipeline completed successfully")
                 
                 # Print summary
@@ -506,7 +1373,10 @@ For the most current information, always refer to the official sources listed in
 def main():
     """Main entry point"""
     researcher = KBResearcher()
-    return researcher.run()
+    try:
+        return researcher.run()
+    finally:
+        researcher.close()
 
 
 if __name__ == "__main__":
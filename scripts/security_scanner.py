@@ -14,6 +14,105 @@ from datetime import datetime
 
 REPO_ROOT = Path(__file__).parent.parent
 
+
+def _compile_patterns(patterns: List[Tuple[str, str, str]],
+                      flags: int = re.IGNORECASE) -> List[Tuple[re.Pattern, str, str]]:
+    """Compile (pattern, severity, description) rules once at import time"""
+    return [(re.compile(pattern, flags), severity, description) for pattern, severity, description in patterns]
+
+
+def _any_pattern(patterns: List[Tuple[re.Pattern, str, str]]) -> re.Pattern:
+    """Combine compiled rules into one alternation that finds whether any
+    of them matches in a single pass over the content.
+    
+    Used only to skip clean files: an alternation reports one match per
+    position, so overlapping findings still come from the individual rules.
+    """
+    return re.compile(
+        "|".join(f"(?:{regex.pattern})" for regex, _, _ in patterns),
+        patterns[0][0].flags
+    )
+
+
+# Dangerous patterns checked in each file type, compiled once
+
+# Python files
+PYTHON_PATTERNS = _compile_patterns([
+    (r'\beval\s*\(', "CRITICAL", "eval() can execute arbitrary code"),
+    (r'\bexec\s*\(', "CRITICAL", "exec() can execute arbitrary code"),
+    (r'\b__import__\s*\(', "HIGH", "Dynamic imports can be dangerous"),
+    (r'subprocess\.call\([^)]*shell\s*=\s*True', "CRITICAL", "Shell injection vulnerability"),
+    (r'os\.system\s*\(', "CRITICAL", "Command injection vulnerability"),
+    (r'pickle\.loads?\s*\(', "HIGH", "Pickle deserialization can execute code"),
+    (r'input\s*\([^)]*\)\s*\)', "MEDIUM", "User input without validation"),
+    (r'open\s*\([^)]*[\'"]w[\'"]', "LOW", "File write operation"),
+    (r'requests\.get\([^)]*verify\s*=\s*False', "MEDIUM", "SSL verification disabled"),
+    (r'\.execute\s*\([^)]*%', "HIGH", "Potential SQL injection"),
+    (r'eval\(f[\'"]', "CRITICAL", "F-string in eval() - code execution"),
+    (r'__file__.*\.\.', "MEDIUM", "Path traversal attempt"),
+    (r'os\.environ\[[\'"][A-Z_]+[\'"]\]\s*=', "LOW", "Environment variable modification"),
+    (r'sys\.path\.insert\s*\(', "MEDIUM", "Python path manipulation"),
+    (r'compile\s*\(.*,.*[\'"]eval[\'"]', "HIGH", "Dynamic code compilation"),
+], re.IGNORECASE | re.MULTILINE)
+PYTHON_ANY = _any_pattern(PYTHON_PATTERNS)
+
+# JSON files
+JSON_PATTERNS = _compile_patterns([
+    (r'<script[^>]*>', "CRITICAL", "Script tag in JSON - XSS attempt"),
+    (r'javascript:', "HIGH", "JavaScript protocol - XSS attempt"),
+    (r'on\w+\s*=', "HIGH", "Event handler - XSS attempt"),
+    (r'eval\s*\(', "CRITICAL", "eval() in JSON"),
+    (r'__proto__', "HIGH", "Prototype pollution attempt"),
+    (r'constructor\s*\[', "HIGH", "Constructor injection attempt"),
+])
+JSON_ANY = _any_pattern(JSON_PATTERNS)
+
+# Markdown files
+MARKDOWN_PATTERNS = _compile_patterns([
+    (r'<script[^>]*>', "CRITICAL", "Script tag in markdown"),
+    (r'<iframe[^>]*>', "HIGH", "Iframe injection attempt"),
+    (r'javascript:', "HIGH", "JavaScript protocol"),
+    (r'data:text/html', "MEDIUM", "Data URI HTML"),
+    (r'\[.*\]\(javascript:', "HIGH", "JavaScript in link"),
+    (r'<img[^>]*onerror\s*=', "HIGH", "Image with error handler - XSS"),
+    (r'<\s*svg[^>]*onload\s*=', "HIGH", "SVG with onload - XSS"),
+])
+MARKDOWN_ANY = _any_pattern(MARKDOWN_PATTERNS)
+
+# HTML files
+HTML_PATTERNS = _compile_patterns([
+    (r'<script[^>]*src\s*=\s*["\']https?://(?!cdn\.)', "HIGH", "External script from non-CDN"),
+    (r'eval\s*\(', "CRITICAL", "eval() in JavaScript"),
+    (r'innerHTML\s*=', "MEDIUM", "innerHTML assignment - potential XSS"),
+    (r'document\.write\s*\(', "HIGH", "document.write() - XSS vector"),
+    (r'on\w+\s*=\s*["\'][^"\']*["\']', "MEDIUM", "Inline event handler"),
+    (r'<iframe[^>]*>', "MEDIUM", "Iframe usage"),
+])
+HTML_ANY = _any_pattern(HTML_PATTERNS)
+
+# JavaScript files
+JAVASCRIPT_PATTERNS = _compile_patterns([
+    (r'\beval\s*\(', "CRITICAL", "eval() can execute arbitrary code"),
+    (r'Function\s*\(', "HIGH", "Function constructor - code execution"),
+    (r'setTimeout\s*\([^,)]*[\'"]', "MEDIUM", "String in setTimeout"),
+    (r'setInterval\s*\([^,)]*[\'"]', "MEDIUM", "String in setInterval"),
+    (r'document\.write\s*\(', "HIGH", "document.write() - XSS vector"),
+    (r'innerHTML\s*=\s*(?![\'"]).', "MEDIUM", "Dynamic innerHTML"),
+])
+JAVASCRIPT_ANY = _any_pattern(JAVASCRIPT_PATTERNS)
+
+# Shell and PowerShell scripts
+SHELL_PATTERNS = _compile_patterns([
+    (r'\$\([^)]*\$', "HIGH", "Nested command substitution"),
+    (r'eval\s+', "CRITICAL", "eval in shell script"),
+    (r'curl.*\|\s*bash', "CRITICAL", "Piping curl to bash"),
+    (r'wget.*\|\s*sh', "CRITICAL", "Piping wget to shell"),
+    (r'rm\s+-rf\s+/', "CRITICAL", "Recursive delete from root"),
+    (r'chmod\s+777', "MEDIUM", "Overly permissive chmod"),
+])
+SHELL_ANY = _any_pattern(SHELL_PATTERNS)
+
+
 class SecurityScanner:
     """Comprehensive security scanner"""
     
@@ -56,24 +155,6 @@ class SecurityScanner:
         """Scan Python files for malicious patterns"""
         self.log("\n--- Scanning Python Files ---")
         
-        dangerous_patterns = [
-            (r'\beval\s*\(', "CRITICAL", "eval() can execute arbitrary code"),
-            (r'\bexec\s*\(', "CRITICAL", "exec() can execute arbitrary code"),
-            (r'\b__import__\s*\(', "HIGH", "Dynamic imports can be dangerous"),
-            (r'subprocess\.call\([^)]*shell\s*=\s*True', "CRITICAL", "Shell injection vulnerability"),
-            (r'os\.system\s*\(', "CRITICAL", "Command injection vulnerability"),
-            (r'pickle\.loads?\s*\(', "HIGH", "Pickle deserialization can execute code"),
-            (r'input\s*\([^)]*\)\s*\)', "MEDIUM", "User input without validation"),
-            (r'open\s*\([^)]*[\'"]w[\'"]', "LOW", "File write operation"),
-            (r'requests\.get\([^)]*verify\s*=\s*False', "MEDIUM", "SSL verification disabled"),
-            (r'\.execute\s*\([^)]*%', "HIGH", "Potential SQL injection"),
-            (r'eval\(f[\'"]', "CRITICAL", "F-string in eval() - code execution"),
-            (r'__file__.*\.\.', "MEDIUM", "Path traversal attempt"),
-            (r'os\.environ\[[\'"][A-Z_]+[\'"]\]\s*=', "LOW", "Environment variable modification"),
-            (r'sys\.path\.insert\s*\(', "MEDIUM", "Python path manipulation"),
-            (r'compile\s*\(.*,.*[\'"]eval[\'"]', "HIGH", "Dynamic code compilation"),
-        ]
-        
         for py_file in REPO_ROOT.rglob("*.py"):
             # Skip virtual environments and hidden directories
             if any(part.startswith('.') or part == 'venv' or part == '__pycache__' 
@@ -84,16 +165,18 @@ class SecurityScanner:
                 content = py_file.read_text()
                 self.safe_count += 1
                 
-                for pattern, severity, description in dangerous_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                    for match in matches:
+                if not PYTHON_ANY.search(content):
+                    continue
+                
+                for regex, severity, description in PYTHON_PATTERNS:
+                    for match in regex.finditer(content):
                         line_num = content[:match.start()].count('\n') + 1
                         
                         alert = {
                             "file": str(py_file.relative_to(REPO_ROOT)),
                             "line": line_num,
                             "severity": severity,
-                            "pattern": pattern,
+                            "pattern": regex.pattern,
                             "description": description,
                             "code_snippet": self._get_line(content, line_num)
                         }
@@ -113,15 +196,6 @@ class SecurityScanner:
         """Scan JSON files for malicious content"""
         self.log("\n--- Scanning JSON Files ---")
         
-        dangerous_patterns = [
-            (r'<script[^>]*>', "CRITICAL", "Script tag in JSON - XSS attempt"),
-            (r'javascript:', "HIGH", "JavaScript protocol - XSS attempt"),
-            (r'on\w+\s*=', "HIGH", "Event handler - XSS attempt"),
-            (r'eval\s*\(', "CRITICAL", "eval() in JSON"),
-            (r'__proto__', "HIGH", "Prototype pollution attempt"),
-            (r'constructor\s*\[', "HIGH", "Constructor injection attempt"),
-        ]
-        
         for json_file in REPO_ROOT.rglob("*.json"):
             if any(part.startswith('.') for part in json_file.parts):
                 continue
@@ -143,9 +217,11 @@ class SecurityScanner:
                     })
                 
                 # Pattern matching
-                for pattern, severity, description in dangerous_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
+                if not JSON_ANY.search(content):
+                    continue
+                
+                for regex, severity, description in JSON_PATTERNS:
+                    for match in regex.finditer(content):
                         line_num = content[:match.start()].count('\n') + 1
                         
                         alert = {
@@ -169,16 +245,6 @@ class SecurityScanner:
         """Scan markdown files for malicious content"""
         self.log("\n--- Scanning Markdown Files ---")
         
-        dangerous_patterns = [
-            (r'<script[^>]*>', "CRITICAL", "Script tag in markdown"),
-            (r'<iframe[^>]*>', "HIGH", "Iframe injection attempt"),
-            (r'javascript:', "HIGH", "JavaScript protocol"),
-            (r'data:text/html', "MEDIUM", "Data URI HTML"),
-            (r'\[.*\]\(javascript:', "HIGH", "JavaScript in link"),
-            (r'<img[^>]*onerror\s*=', "HIGH", "Image with error handler - XSS"),
-            (r'<\s*svg[^>]*onload\s*=', "HIGH", "SVG with onload - XSS"),
-        ]
-        
         for md_file in REPO_ROOT.rglob("*.md"):
             if any(part.startswith('.') for part in md_file.parts):
                 continue
@@ -187,9 +253,11 @@ class SecurityScanner:
                 content = md_file.read_text()
                 self.safe_count += 1
                 
-                for pattern, severity, description in dangerous_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
+                if not MARKDOWN_ANY.search(content):
+                    continue
+                
+                for regex, severity, description in MARKDOWN_PATTERNS:
+                    for match in regex.finditer(content):
                         line_num = content[:match.start()].count('\n') + 1
                         
                         alert = {
@@ -213,15 +281,6 @@ class SecurityScanner:
         """Scan HTML files for XSS and other vulnerabilities"""
         self.log("\n--- Scanning HTML Files ---")
         
-        dangerous_patterns = [
-            (r'<script[^>]*src\s*=\s*["\']https?://(?!cdn\.)', "HIGH", "External script from non-CDN"),
-            (r'eval\s*\(', "CRITICAL", "eval() in JavaScript"),
-            (r'innerHTML\s*=', "MEDIUM", "innerHTML assignment - potential XSS"),
-            (r'document\.write\s*\(', "HIGH", "document.write() - XSS vector"),
-            (r'on\w+\s*=\s*["\'][^"\']*["\']', "MEDIUM", "Inline event handler"),
-            (r'<iframe[^>]*>', "MEDIUM", "Iframe usage"),
-        ]
-        
         for html_file in REPO_ROOT.rglob("*.html"):
             if any(part.startswith('.') for part in html_file.parts):
                 continue
@@ -230,9 +289,11 @@ class SecurityScanner:
                 content = html_file.read_text()
                 self.safe_count += 1
                 
-                for pattern, severity, description in dangerous_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
+                if not HTML_ANY.search(content):
+                    continue
+                
+                for regex, severity, description in HTML_PATTERNS:
+                    for match in regex.finditer(content):
                         line_num = content[:match.start()].count('\n') + 1
                         
                         alert = {
@@ -256,15 +317,6 @@ class SecurityScanner:
         """Scan JavaScript files"""
         self.log("\n--- Scanning JavaScript Files ---")
         
-        dangerous_patterns = [
-            (r'\beval\s*\(', "CRITICAL", "eval() can execute arbitrary code"),
-            (r'Function\s*\(', "HIGH", "Function constructor - code execution"),
-            (r'setTimeout\s*\([^,)]*[\'"]', "MEDIUM", "String in setTimeout"),
-            (r'setInterval\s*\([^,)]*[\'"]', "MEDIUM", "String in setInterval"),
-            (r'document\.write\s*\(', "HIGH", "document.write() - XSS vector"),
-            (r'innerHTML\s*=\s*(?![\'"]).', "MEDIUM", "Dynamic innerHTML"),
-        ]
-        
         for js_file in REPO_ROOT.rglob("*.js"):
             if any(part.startswith('.') or part == 'node_modules' for part in js_file.parts):
                 continue
@@ -273,9 +325,11 @@ class SecurityScanner:
                 content = js_file.read_text()
                 self.safe_count += 1
                 
-                for pattern, severity, description in dangerous_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
+                if not JAVASCRIPT_ANY.search(content):
+                    continue
+                
+                for regex, severity, description in JAVASCRIPT_PATTERNS:
+                    for match in regex.finditer(content):
                         line_num = content[:match.start()].count('\n') + 1
                         
                         alert = {
@@ -299,15 +353,6 @@ class SecurityScanner:
         """Scan shell scripts for command injection"""
         self.log("\n--- Scanning Shell Scripts ---")
         
-        dangerous_patterns = [
-            (r'\$\([^)]*\$', "HIGH", "Nested command substitution"),
-            (r'eval\s+', "CRITICAL", "eval in shell script"),
-            (r'curl.*\|\s*bash', "CRITICAL", "Piping curl to bash"),
-            (r'wget.*\|\s*sh', "CRITICAL", "Piping wget to shell"),
-            (r'rm\s+-rf\s+/', "CRITICAL", "Recursive delete from root"),
-            (r'chmod\s+777', "MEDIUM", "Overly permissive chmod"),
-        ]
-        
         for sh_file in list(REPO_ROOT.rglob("*.sh")) + list(REPO_ROOT.rglob("*.ps1")):
             if any(part.startswith('.') for part in sh_file.parts):
                 continue
@@ -316,9 +361,11 @@ class SecurityScanner:
                 content = sh_file.read_text()
                 self.safe_count += 1
                 
-                for pattern, severity, description in dangerous_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
+                if not SHELL_ANY.search(content):
+                    continue
+                
+                for regex, severity, description in SHELL_PATTERNS:
+                    for match in regex.finditer(content):
                         line_num = content[:match.start()].count('\n') + 1
                         
                         alert = {
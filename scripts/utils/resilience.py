@@ -10,6 +10,7 @@ This module provides bulletproof patterns for:
 """
 
 import time
+import random
 import logging
 import functools
 import re
@@ -33,20 +34,22 @@ class ResilientLogger:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
     
-    def info(self, msg: str, **kwargs):
-        self.logger.info(msg, **kwargs)
+    # Positional args are passed through for lazy %-style formatting, so
+    # messages below the active level are never built.
+    def info(self, msg: str, *args, **kwargs):
+        self.logger.info(msg, *args, **kwargs)
     
-    def warn(self, msg: str, **kwargs):
-        self.logger.warning(msg, **kwargs)
+    def warn(self, msg: str, *args, **kwargs):
+        self.logger.warning(msg, *args, **kwargs)
     
-    def error(self, msg: str, exc_info: bool = False, **kwargs):
-        self.logger.error(msg, exc_info=exc_info, **kwargs)
+    def error(self, msg: str, *args, exc_info: bool = False, **kwargs):
+        self.logger.error(msg, *args, exc_info=exc_info, **kwargs)
     
-    def debug(self, msg: str, **kwargs):
-        self.logger.debug(msg, **kwargs)
+    def debug(self, msg: str, *args, **kwargs):
+        self.logger.debug(msg, *args, **kwargs)
     
-    def critical(self, msg: str, exc_info: bool = False, **kwargs):
-        self.logger.critical(msg, exc_info=exc_info, **kwargs)
+    def critical(self, msg: str, *args, exc_info: bool = False, **kwargs):
+        self.logger.critical(msg, *args, exc_info=exc_info, **kwargs)
 
 
 def retry_with_backoff(
@@ -54,7 +57,9 @@ def retry_with_backoff(
     base_delay: float = 1.0,
     max_delay: float = 30.0,
     exponential_base: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    jitter: float = 0.0,
+    giveup_on: tuple = ()
 ):
     """
     Decorator that implements exponential backoff retry logic.
@@ -65,6 +70,11 @@ def retry_with_backoff(
         max_delay: Maximum delay between retries (default: 30.0)
         exponential_base: Base for exponential calculation (default: 2.0)
         exceptions: Tuple of exception types to catch (default: Exception)
+        jitter: Upper bound of a random extra delay in seconds, so calls that
+            failed together (e.g. concurrent requests hitting a 429) don't
+            all retry in lockstep (default: 0.0)
+        giveup_on: Tuple of exception types re-raised at once without
+            retrying, even if they are also in exceptions (default: none)
     
     Example:
         @retry_with_backoff(max_attempts=3, base_delay=2.0)
@@ -79,6 +89,8 @@ def retry_with_backoff(
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
+                except giveup_on:
+                    raise
                 except exceptions as e:
                     if attempt == max_attempts:
                         logger.error(
@@ -89,6 +101,8 @@ def retry_with_backoff(
                     
                     # Calculate delay with exponential backoff
                     delay = min(base_delay * (exponential_base ** (attempt - 1)), max_delay)
+                    if jitter:
+                        delay += random.uniform(0, jitter)
                     logger.warn(
                         f"{func.__name__} attempt {attempt}/{max_attempts} failed: {e}. "
                         f"Retrying in {delay:.1f}s..."
@@ -177,7 +191,7 @@ def safe_json_load(data: str, default: Any = None, logger: Optional[ResilientLog
 
 def safe_file_write(
     filepath: str,
-    content: str,
+    content: Union[str, bytes],
     mode: str = 'w',
     encoding: str = 'utf-8',
     create_dirs: bool = True,
@@ -188,7 +202,7 @@ def safe_file_write(
     
     Args:
         filepath: Path to file
-        content: Content to write
+        content: Content to write (bytes are written as-is, ignoring encoding)
         mode: File mode ('w' or 'a')
         encoding: File encoding
         create_dirs: Whether to create parent directories
@@ -204,8 +218,12 @@ def safe_file_write(
         if create_dirs:
             Path(filepath).parent.mkdir(parents=True, exist_ok=True)
         
-        with open(filepath, mode, encoding=encoding) as f:
-            f.write(content)
+        if isinstance(content, bytes):
+            with open(filepath, mode.replace('b', '') + 'b') as f:
+                f.write(content)
+        else:
+            with open(filepath, mode, encoding=encoding) as f:
+                f.write(content)
         
         return True
     except (IOError, OSError) as e:
@@ -214,6 +232,65 @@ def safe_file_write(
         return False
 
 
+def atomic_file_write(
+    filepath: str,
+    content: Union[str, bytes, list, tuple],
+    encoding: str = 'utf-8',
+    create_dirs: bool = True,
+    logger: Optional[ResilientLogger] = None
+) -> bool:
+    """
+    Atomically replace a file's contents.
+    
+    Writes to a temporary file in the same directory, fsyncs it and then
+    os.replace()s it over the target, so readers never see a torn file.
+    
+    Args:
+        filepath: Path to file
+        content: Content to write (str is encoded, bytes written as-is); a
+            list/tuple of such parts is written in order without joining
+            them into one buffer first
+        encoding: Encoding used when content is str
+        create_dirs: Whether to create parent directories
+        logger: Optional logger for error reporting
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    import os
+    import tempfile
+    from pathlib import Path
+    
+    path = Path(filepath)
+    parts = content if isinstance(content, (list, tuple)) else (content,)
+    tmp_name = None
+    
+    try:
+        if create_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with tempfile.NamedTemporaryFile(
+            'wb', dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_name = tmp.name
+            for part in parts:
+                tmp.write(part.encode(encoding) if isinstance(part, str) else part)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        
+        os.replace(tmp_name, path)
+        return True
+    except (IOError, OSError) as e:
+        if tmp_name:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        if logger:
+            logger.error(f"Failed to write to {filepath}: {e}", exc_info=True)
+        return False
+
+
 def safe_file_read(
     filepath: str,
     default: str = "",
@@ -247,6 +324,7 @@ def resilient_request(
     method: str = 'GET',
     timeout: int = 30,
     max_attempts: int = 3,
+    logger: Optional[ResilientLogger] = None,
     **kwargs
 ) -> Optional[Any]:
     """
@@ -257,6 +335,7 @@ def resilient_request(
         method: HTTP method (GET, POST, etc.)
         timeout: Request timeout in seconds
         max_attempts: Maximum retry attempts
+        logger: Optional logger for error reporting
         **kwargs: Additional arguments for requests
     
     Returns:
@@ -273,7 +352,9 @@ def resilient_request(
     
     try:
         return _make_request()
-    except Exception:
+    except Exception as e:
+        if logger:
+            logger.error(f"Request to {url} failed: {e}")
         return None
 
 